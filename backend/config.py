@@ -11,6 +11,9 @@ env_config = {key: value for key, value in os.environ.items()}
 
 APP_ENV = env_config.get("APP_ENV", "development")
 
+# Serve the unauthenticated /metrics/* endpoints; keep off where the API is public
+EXPOSE_METRICS = env_config.get("EXPOSE_METRICS", "false").lower() in ("1", "true", "yes")
+
 print("Env Config", env_config)
 print("App Environment:", APP_ENV)
 
@@ -21,7 +24,8 @@ default_config = {
     "cors": {
         "allow_origins": ["*"],
         "allow_headers": ["*"],
-        "allow_methods": ["*"]
+        "allow_methods": ["*"],
+        "expose_headers": ["X-Next-Cursor", "X-Prev-Cursor", "X-Total-Count"]
     }
 }
 
@@ -1,5 +1,5 @@
 from __future__ import annotations                 
-from collections.abc import Iterable
+from collections.abc import Awaitable, Callable, Iterable
 from types import ModuleType
 from tortoise import Tortoise, connections
 from tortoise.exceptions import DoesNotExist, IntegrityError
@@ -15,6 +15,7 @@ def register_tortoise(
     modules: dict[str, Iterable[str | ModuleType]] | None = None,
     generate_schemas: bool = False,
     add_exception_handlers: bool = True,
+    shutdown_hooks: Iterable[Callable[[], Awaitable[None]]] = (),
 ) -> None:
     """
     Registers ``startup`` and ``shutdown`` events to set-up and tear-down Tortoise-ORM
@@ -74,6 +75,9 @@ def register_tortoise(
     add_exception_handlers:
         True to add some automatic exception handlers for ``DoesNotExist`` & ``IntegrityError``.
         This is not recommended for production systems as it may leak data.
+    shutdown_hooks:
+        Coroutine functions awaited on shutdown, in order, before the connections
+        are closed. Use them to flush anything that still needs the database.
 
     Raises
     ------
@@ -91,6 +95,8 @@ def register_tortoise(
 
     @app.on_shutdown
     async def close_orm() -> None:  # pylint: disable=W0612
+        for hook in shutdown_hooks:
+            await hook()
         await connections.close_all()
         logger.info("Tortoise-ORM shutdown")
 
@@ -1,6 +1,6 @@
 from nexios import NexiosApp
-from routes.index.route import index_router
-from config import app_config, db_config
+from routes.index.route import index_router, metrics_router
+from config import app_config, db_config, EXPOSE_METRICS
 from db import register_tortoise
 from pydantic import ValidationError
 from utils.pydantic_error import handle_pydantic_error
@@ -15,6 +15,10 @@ from routes.public import public_router
 from routes.responses import responses_router
 from routes.templates import templates_router
 from routes.accounts import accounts_router
+from utils.ingest import submission_buffer
+from utils.json_encoder import install_json_encoder
+install_json_encoder()
+
 JWT_Backend = JWTAuthBackend(
     authenticate_func=get_user_by_id
 )
@@ -28,8 +32,11 @@ app.add_middleware(
     AuthenticationMiddleware(backend=JWT_Backend)
 )
 app.add_middleware(CORSMiddleware())
-register_tortoise(app,config=db_config)
+register_tortoise(app,config=db_config, shutdown_hooks=[submission_buffer.stop])
 
+app.mount_router(index_router)
+if EXPOSE_METRICS:
+    app.mount_router(metrics_router)
 app.mount_router(auth_router)
 app.mount_router(forms_router)
 app.mount_router(public_router)
@@ -0,0 +1,14 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "forms" ADD "response_count" INT NOT NULL DEFAULT 0;
+        UPDATE "forms" SET "response_count" = (
+    SELECT COUNT(*) FROM "formresponse" WHERE "formresponse"."form_ref_id" = "forms"."id"
+);"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "forms" DROP COLUMN "response_count";"""
@@ -0,0 +1,35 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "response_rollups" (
+    "id" UUID NOT NULL PRIMARY KEY,
+    "created_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "granularity" VARCHAR(8) NOT NULL,
+    "bucket" TIMESTAMPTZ NOT NULL,
+    "dimension" VARCHAR(16) NOT NULL,
+    "value" VARCHAR(512) NOT NULL,
+    "total" INT NOT NULL DEFAULT 0,
+    "form_ref_id" UUID NOT NULL REFERENCES "forms" ("id") ON DELETE CASCADE,
+    CONSTRAINT "uid_response_ro_form_re_557812" UNIQUE ("form_ref_id", "granularity", "bucket", "dimension", "value")
+);
+        INSERT INTO "response_rollups" ("id", "form_ref_id", "granularity", "bucket", "dimension", "value", "total")
+SELECT md5(random()::text || clock_timestamp()::text)::uuid, r."form_ref_id", g."granularity",
+       date_trunc(g."granularity", r."created_at" AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+       d."dimension", d."value", COUNT(*)
+FROM "formresponse" r
+CROSS JOIN (VALUES ('hour'), ('day')) AS g("granularity")
+CROSS JOIN LATERAL (VALUES
+    ('device', COALESCE(r."device_family", '')),
+    ('os', COALESCE(r."device_os", '')),
+    ('browser', COALESCE(r."device_browser", '')),
+    ('brand', COALESCE(r."device_brand", ''))
+) AS d("dimension", "value")
+GROUP BY 2, 3, 4, 5, 6;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "response_rollups";"""
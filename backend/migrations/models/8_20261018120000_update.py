@@ -0,0 +1,40 @@
+from tortoise import BaseDBAsyncClient
+
+# Aerich runs a migration as one script, which Postgres executes as a single
+# transaction, so CREATE INDEX CONCURRENTLY cannot be used here. On a large
+# live database, build the indexes online first, one statement at a time:
+#
+#   CREATE UNIQUE INDEX CONCURRENTLY "forms_public_id_key" ON "forms" ("public_id");
+#   ALTER TABLE "forms" ADD CONSTRAINT "forms_public_id_key" UNIQUE USING INDEX "forms_public_id_key";
+#   CREATE INDEX CONCURRENTLY "idx_forms_owner_i_6a54dd" ON "forms" ("owner_id", "created_at");
+#   CREATE INDEX CONCURRENTLY "idx_user_email_1b4f1c" ON "user" ("email");
+#
+# (after running the public_id de-duplication below), and this migration only
+# records them. "formresponse" ("form_ref_id", "created_at") is already indexed
+# by migration 7, and the lookups on "otp_codes" ("user_id", "code") are served
+# by its existing UNIQUE ("code", "user_id") constraint.
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        UPDATE "forms" f SET "public_id" = left(md5(f."id"::text || clock_timestamp()::text), 12)
+WHERE EXISTS (
+    SELECT 1 FROM "forms" o
+    WHERE o."public_id" = f."public_id" AND (o."created_at", o."id") < (f."created_at", f."id")
+);
+        DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'forms_public_id_key') THEN
+        ALTER TABLE "forms" ADD CONSTRAINT "forms_public_id_key" UNIQUE ("public_id");
+    END IF;
+END
+$$;
+        CREATE INDEX IF NOT EXISTS "idx_forms_owner_i_6a54dd" ON "forms" ("owner_id", "created_at");
+        CREATE INDEX IF NOT EXISTS "idx_user_email_1b4f1c" ON "user" ("email");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "forms" DROP CONSTRAINT IF EXISTS "forms_public_id_key";
+        DROP INDEX IF EXISTS "idx_forms_owner_i_6a54dd";
+        DROP INDEX IF EXISTS "idx_user_email_1b4f1c";"""
@@ -3,4 +3,5 @@ from .forms import Forms
 from .form_sections import FormSections
 from .form_fields import FormFields
 from .form_response import FormResponse
-from .otp import OTPCode
\ No newline at end of file
+from .otp import OTPCode
+from .response_rollup import ResponseRollup
@@ -9,14 +9,16 @@ class FormResponse(BaseModel):
     device_os = f.CharField(max_length = 512, null = True)
     device_browser = f.CharField(max_length = 512, null = True)
 
+    class Meta:
+        indexes = (("form_ref_id", "created_at"),) # time-range scans per form (analytics, exports)
 
-    async def to_dict(self) -> dict:
-        form_ref = await self.form_ref
+
+    def to_dict(self) -> dict:
         return {
             "id": self.id,
             "created_at": self.created_at,
             "updated_at": self.updated_at,
-            "form_ref": form_ref.id,
+            "form_ref": self.form_ref_id,
             "response": self.response,
             "device_family": self.device_family,
             "device_brand": self.device_brand,
@@ -24,4 +26,24 @@ class FormResponse(BaseModel):
             "device_browser": self.device_browser,
         }
 
-    
\ No newline at end of file
+    @staticmethod
+    def row_to_dict(row: dict) -> dict:
+        """
+        Same shape as ``to_dict`` for a row fetched with ``.values(*SERIALIZED_FIELDS)``,
+        so listings can skip building model instances. Mutates ``row`` in place.
+        """
+        row["form_ref"] = row.pop("form_ref_id")
+        return row
+
+
+SERIALIZED_FIELDS = (
+    "id",
+    "created_at",
+    "updated_at",
+    "form_ref_id",
+    "response",
+    "device_family",
+    "device_brand",
+    "device_os",
+    "device_browser",
+)
@@ -1,7 +1,10 @@
 from email.policy import default
 from .base import BaseModel
 from tortoise import fields as f
-import time, uuid, hashlib
+from tortoise.exceptions import IntegrityError
+from tortoise.expressions import F, Q
+from tortoise.transactions import in_transaction
+from utils.public_ids import PUBLIC_ID_MAX_ATTEMPTS, generate_public_id, is_public_id_conflict
 class Forms(BaseModel):
 
     title = f.CharField(
@@ -61,20 +64,52 @@ class Forms(BaseModel):
 
     multi_response = f.BooleanField(default = True)
 
-    public_id = f.CharField(max_length=100, null=True)
+    public_id = f.CharField(max_length=100, null=True, unique=True)
+
+    response_count = f.IntField(default = 0) # Denormalized COUNT(*) of responses, see utils/counters.py
 
     fields : f.BackwardFKRelation["FormFields"]
     class Meta:
         table = "forms"
+        indexes = (("owner_id", "created_at"),)
 
 
     def generate_public_id(self):
-        unique_data = f"{uuid.uuid4()}-{time.time()}"
-        full_hash = hashlib.sha1(unique_data.encode()).hexdigest()
-        return full_hash[:6]
+        return generate_public_id()
+
+    @classmethod
+    async def reserve_responses(cls, form_id, count = 1, using_db = None) -> bool:
+        """
+        Atomically bumps ``response_count`` by ``count`` unless that would go past
+        ``max_response``. Returns ``False`` when the limit is reached.
+
+        A ``max_response`` of ``NULL`` or ``0`` (what older forms store) means no limit.
+        """
+        return bool(await cls.filter(
+            Q(max_response__isnull = True) | Q(max_response = 0) | Q(max_response__gte = F("response_count") + count),
+            id = form_id,
+        ).using_db(using_db).update(response_count = F("response_count") + count))
+
+    @classmethod
+    async def release_responses(cls, form_id, count = 1, using_db = None):
+        await cls.filter(id = form_id).using_db(using_db).update(response_count = F("response_count") - count)
 
     async def save(self, *args, **kwargs):
-        if not self.public_id:
+        if self.public_id:
+            return await super().save(*args, **kwargs)
+
+        # Retry with a fresh id if the generated one collides with the unique
+        # constraint; each attempt runs in its own (nested) transaction so a failed
+        # insert does not abort an enclosing one.
+        using_db = kwargs.pop("using_db", None)
+        for attempt in range(PUBLIC_ID_MAX_ATTEMPTS):
             self.public_id = self.generate_public_id()
-        return await super().save(*args, **kwargs)
+            try:
+                async with in_transaction(using_db.connection_name if using_db else None) as conn:
+                    return await super().save(*args, using_db=conn, **kwargs)
+            except IntegrityError as exc:
+                if not is_public_id_conflict(exc):
+                    raise
+                if attempt == PUBLIC_ID_MAX_ATTEMPTS - 1:
+                    raise
 
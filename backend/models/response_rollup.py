@@ -0,0 +1,23 @@
+from .base import BaseModel
+from tortoise import fields as f
+
+
+class ResponseRollup(BaseModel):
+    """
+    Pre-aggregated response counts of a form per time bucket and device dimension.
+
+    One row holds how many responses of ``form_ref`` arrived in the ``granularity``
+    bucket starting at ``bucket`` (UTC) with ``dimension`` equal to ``value``,
+    e.g. ``("day", 2025-06-01, "browser", "Chrome") -> 42``. Rows are upserted
+    by utils/rollups.py as responses are written.
+    """
+    form_ref = f.ForeignKeyField("models.Forms", related_name="rollups")
+    granularity = f.CharField(max_length = 8) # "hour" or "day"
+    bucket = f.DatetimeField()
+    dimension = f.CharField(max_length = 16) # "device", "os", "browser" or "brand"
+    value = f.CharField(max_length = 512)
+    total = f.IntField(default = 0)
+
+    class Meta:
+        table = "response_rollups"
+        unique_together = (("form_ref", "granularity", "bucket", "dimension", "value"),)
@@ -1,7 +1,7 @@
 from email.policy import default
 from .base import  BaseModel
 from tortoise import fields as f
-import bcrypt
+from utils.passwords import hash_password, verify_password
 
 
 
@@ -18,7 +18,8 @@ class User(BaseModel):
     )
 
     email  = f.CharField(
-        max_length = 120
+        max_length = 120,
+        index = True
     )
 
     hashed_password = f.TextField()
@@ -29,16 +30,16 @@ class User(BaseModel):
         default = False
     )
 
-    def set_password(self, password):
-        self.hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    async def set_password(self, password):
+        self.hashed_password = await hash_password(password)
 
-    def check_password(self, password):
-        return bcrypt.checkpw(password.encode('utf-8'), self.hashed_password.encode('utf-8'))
+    async def check_password(self, password):
+        return await verify_password(password, self.hashed_password)
     
     @classmethod
     async def create_user(cls, first_name, last_name, email, password, company = None):
         user = cls(first_name=first_name, last_name=last_name, email=email, company=company)
-        user.set_password(password)
+        await user.set_password(password)
         await user.save()
         return user
     
@@ -5,6 +5,7 @@ from ._models import UpdateUser
 from models import User
 from nexios.auth.decorator import auth
 from pydantic import create_model
+from utils.user_auth import invalidate_user
 accounts_router = Router(prefix="/v1/account")
 
 @accounts_router.put("/update",
@@ -24,6 +25,9 @@ async def update(req :Request, res: Response):
     if await User.exclude(email = user.email).filter(email = data.email).exists():
         return res.json({"message":"Email Already", 'errors' : {}}, status_code = 400)
     print(data.model_dump(exclude_unset=True))
+    # req.user is the instance shared through the user cache; drop it before
+    # mutating so a failed save cannot leave a half-updated user cached
+    invalidate_user(user.id)
     user.update_from_dict(data.model_dump(exclude_unset=True))
     await user.save()
     return {"success": "User updated successfully"}
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional
 
 class DeviceDistribution(BaseModel):
     desktop: int
@@ -12,3 +12,44 @@ class ResponseStats(BaseModel):
     device_distribution: DeviceDistribution
     browser_distribution: Dict[str, int]
     completion_rate: Optional[float]
+
+
+class FieldStatistics(BaseModel):
+    field_name: str
+    field_type: str
+    answered: int
+    invalid: int = 0
+    stats: Optional[Dict[str, Any]]
+
+
+class FormFieldStatistics(BaseModel):
+    total_responses: int
+    fields: List[FieldStatistics]
+
+
+class TimeSeriesBucket(BaseModel):
+    bucket: str
+    count: int
+
+
+class ResponseTimeSeries(BaseModel):
+    interval: str
+    timezone: str
+    start: str
+    end: str
+    buckets: List[TimeSeriesBucket]
+
+
+class DashboardForm(BaseModel):
+    id: str
+    title: str
+    public_id: Optional[str]
+    responses_count: int
+    last_submission_at: Optional[str]
+    status: str
+    trend: List[int]
+
+
+class OwnerDashboard(BaseModel):
+    trend_days: List[str]
+    forms: List[DashboardForm]
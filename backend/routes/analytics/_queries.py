@@ -0,0 +1,93 @@
+"""
+Raw SQL used by the analytics routes.
+
+Each statement answers one dashboard widget in a single round trip, so the
+grouping happens in the database instead of in Python.
+"""
+
+# One row per device bucket and one per browser of a form, read from the
+# daily rollups so the cost does not grow with the number of responses, plus
+# the form's denormalized response_count. The LEFT JOIN keeps one row for
+# forms without responses; no row at all means the form does not exist or is
+# not owned by the caller.
+RESPONSE_SUMMARY_SQL = """
+SELECT f."response_count", d."device", d."browser", d."total"
+FROM "forms" f
+LEFT JOIN LATERAL (
+    SELECT
+        CASE WHEN r."dimension" = 'device' THEN
+            CASE
+                WHEN r."value" ILIKE '%desktop%' THEN 'desktop'
+                WHEN r."value" ILIKE '%mobile%' THEN 'mobile'
+                WHEN r."value" ILIKE '%tablet%' THEN 'tablet'
+                ELSE 'other'
+            END
+        END AS "device",
+        CASE WHEN r."dimension" = 'browser' THEN
+            NULLIF(split_part(btrim(r."value"), ' ', 1), '')
+        END AS "browser",
+        SUM(r."total") AS "total"
+    FROM "response_rollups" r
+    WHERE r."form_ref_id" = f."id" AND r."granularity" = 'day' AND r."dimension" IN ('device', 'browser')
+    GROUP BY 1, 2
+) d ON TRUE
+WHERE f."id" = $1 AND f."owner_id" = $2
+"""
+
+# Responses per bucket between $3 (inclusive) and $4 (exclusive), truncated to
+# the $2 unit ('hour', 'day' or 'week') in the $5 time zone. generate_series
+# provides every bucket of the range so empty ones come back as 0. The range
+# filter on "created_at" is served by the (form_ref_id, created_at) index.
+RESPONSE_TIMESERIES_SQL = """
+WITH "buckets" AS (
+    SELECT generate_series(
+        date_trunc($2, $3::timestamptz AT TIME ZONE $5),
+        date_trunc($2, ($4::timestamptz - interval '1 microsecond') AT TIME ZONE $5),
+        ('1 ' || $2)::interval
+    ) AS "bucket"
+), "counts" AS (
+    SELECT date_trunc($2, r."created_at" AT TIME ZONE $5) AS "bucket", COUNT(*) AS "total"
+    FROM "formresponse" r
+    WHERE r."form_ref_id" = $1 AND r."created_at" >= $3 AND r."created_at" < $4
+    GROUP BY 1
+)
+SELECT b."bucket", COALESCE(c."total", 0) AS "total"
+FROM "buckets" b
+LEFT JOIN "counts" c ON c."bucket" = b."bucket"
+ORDER BY b."bucket"
+"""
+
+# Every form of owner $1 with its response_count, last submission time and
+# the daily response counts of the 7 UTC days ending on $2 (oldest first).
+# The days are generated as plain timestamps and compared with the buckets
+# read in UTC, so the session time zone never shifts them.
+# The last submission is an index-only lookup on (form_ref_id, created_at)
+# and the trend comes from the daily rollups ("device" rows count each
+# response exactly once), so the cost does not grow with the response table.
+OWNER_DASHBOARD_SQL = """
+SELECT
+    f."id", f."title", f."public_id", f."response_count", f."max_response",
+    f."is_active", f."draft", f."active_until", f."created_at",
+    l."created_at" AS "last_submission_at",
+    t."trend"
+FROM "forms" f
+LEFT JOIN LATERAL (
+    SELECT r."created_at" FROM "formresponse" r
+    WHERE r."form_ref_id" = f."id"
+    ORDER BY r."created_at" DESC
+    LIMIT 1
+) l ON TRUE
+CROSS JOIN LATERAL (
+    SELECT array_agg(COALESCE(c."total", 0) ORDER BY d."day") AS "trend"
+    FROM generate_series(($2::date - 6)::timestamp, $2::date::timestamp, interval '1 day') AS d("day")
+    LEFT JOIN (
+        SELECT u."bucket" AT TIME ZONE 'UTC' AS "bucket", SUM(u."total") AS "total"
+        FROM "response_rollups" u
+        WHERE u."form_ref_id" = f."id" AND u."granularity" = 'day' AND u."dimension" = 'device'
+            AND u."bucket" >= ($2::date - 6)::timestamp AT TIME ZONE 'UTC'
+        GROUP BY u."bucket"
+    ) c ON c."bucket" = d."day"
+) t
+WHERE f."owner_id" = $1
+ORDER BY f."created_at" DESC
+"""
@@ -5,12 +5,17 @@ from nexios.auth.decorator import auth
 from dto.responses import Success200, Error400
 from models.forms import Forms
 from models.form_response import FormResponse
-from tortoise.expressions import Q
-from datetime import datetime, timedelta
+from tortoise import connections
+from uuid import UUID
+from datetime import UTC, datetime, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from nexios.openapi import Query
 import io
 import base64
 from collections import defaultdict
-from ._models import ResponseStats
+from ._models import ResponseStats, FormFieldStatistics, ResponseTimeSeries, OwnerDashboard
+from ._queries import RESPONSE_SUMMARY_SQL, RESPONSE_TIMESERIES_SQL, OWNER_DASHBOARD_SQL
+from utils.field_stats import get_field_stats
 
 analytics_router = Router(prefix="/v1/analytics", tags=["v1", "analytics"])
 
@@ -22,36 +27,150 @@ analytics_router = Router(prefix="/v1/analytics", tags=["v1", "analytics"])
 async def get_response_summary(req: Request, res: Response):
     form_id = req.path_params.get("form_id")
     user = req.user
-    
-    form = await Forms.get_or_none(id=form_id, owner=user)
-    if not form:
-        return res.status(404).json({"error": "Form not found"})
-    
-    total_responses = await FormResponse.filter(form_ref=form).count()
-    
-    # Get response count by device type
-    device_counts = {
-        "desktop": await FormResponse.filter(form_ref=form, device_family__icontains="desktop").count(),
-        "mobile": await FormResponse.filter(form_ref=form, device_family__icontains="mobile").count(),
-        "tablet": await FormResponse.filter(form_ref=form, device_family__icontains="tablet").count(),
-        "other": await FormResponse.filter(form_ref=form).filter(
-            ~Q(device_family__icontains="desktop") &
-            ~Q(device_family__icontains="mobile") &
-            ~Q(device_family__icontains="tablet")
-        ).count()
-    }
-    
-    # Get browser distribution
-    browsers = await FormResponse.filter(form_ref=form).values_list("device_browser", flat=True)
+    try:
+        form_id = UUID(form_id)
+    except (TypeError, ValueError):
+        return res.json({"error": "Form not found"}, status_code=404)
+
+    rows = await connections.get("default").execute_query_dict(RESPONSE_SUMMARY_SQL, [form_id, user.id])
+    if not rows:
+        return res.json({"error": "Form not found"}, status_code=404)
+
+    device_counts = {"desktop": 0, "mobile": 0, "tablet": 0, "other": 0}
     browser_distribution = defaultdict(int)
-    for browser in browsers:
-        if browser:
-            browser_distribution[browser.split()[0]] += 1 
+    for row in rows:
+        if row["device"]:
+            device_counts[row["device"]] += row["total"]
+        elif row["browser"]:
+            browser_distribution[row["browser"]] += row["total"]
     
     return {
-        "total_responses": total_responses,
+        "total_responses": rows[0]["response_count"],
         "device_distribution": device_counts,
         "browser_distribution": dict(browser_distribution),
         "completion_rate": None,  # Could be calculated if you track started responses
     }
 
+
+@analytics_router.get("/responses/{form_id}/fields",
+                     summary="Get Per-Field Answer Statistics",
+                     security=[{"bearerAuth": []}],
+                     responses={200: FormFieldStatistics, 400: Error400})
+@auth(["jwt"])
+async def get_field_statistics(req: Request, res: Response):
+    form_id = req.path_params.get("form_id")
+    try:
+        form = await Forms.get_or_none(id=UUID(form_id), owner=req.user)
+    except (TypeError, ValueError):
+        form = None
+    if not form:
+        return res.json({"error": "Form not found"}, status_code=404)
+
+    return {
+        "total_responses": form.response_count,
+        "fields": await get_field_stats(form),
+    }
+
+
+TIMESERIES_INTERVALS = {
+    "hour": timedelta(hours=48),
+    "day": timedelta(days=30),
+    "week": timedelta(weeks=26),
+}
+TIMESERIES_MAX_BUCKETS = 5000
+
+
+@analytics_router.get("/responses/{form_id}/timeseries",
+                     summary="Get Responses per Hour/Day/Week",
+                     security=[{"bearerAuth": []}],
+                     parameters=[Query(name="interval"), Query(name="start"), Query(name="end"), Query(name="tz")],
+                     responses={200: ResponseTimeSeries, 400: Error400})
+@auth(["jwt"])
+async def get_response_timeseries(req: Request, res: Response):
+    form_id = req.path_params.get("form_id")
+    interval = req.query_params.get("interval", "day")
+    tz_name = req.query_params.get("tz", "UTC")
+    if interval not in TIMESERIES_INTERVALS:
+        return res.json({"message": "detail", "errors": {"interval": f"must be one of {list(TIMESERIES_INTERVALS)}"}}, status_code=400)
+    try:
+        tz = ZoneInfo(tz_name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return res.json({"message": "detail", "errors": {"tz": "unknown time zone"}}, status_code=400)
+    try:
+        end = _parse_moment(req.query_params.get("end"), tz) or datetime.now(UTC)
+        start = _parse_moment(req.query_params.get("start"), tz) or end - TIMESERIES_INTERVALS[interval]
+    except ValueError:
+        return res.json({"message": "detail", "errors": {"start": "start and end must be ISO 8601 dates"}}, status_code=400)
+    if start >= end:
+        return res.json({"message": "detail", "errors": {"start": "start must be before end"}}, status_code=400)
+    step = {"hour": timedelta(hours=1), "day": timedelta(days=1), "week": timedelta(weeks=1)}[interval]
+    if (end - start) / step > TIMESERIES_MAX_BUCKETS:
+        return res.json({"message": "detail", "errors": {"interval": "range too large for this interval"}}, status_code=400)
+
+    try:
+        form = await Forms.get_or_none(id=UUID(form_id), owner=req.user)
+    except (TypeError, ValueError):
+        form = None
+    if not form:
+        return res.json({"error": "Form not found"}, status_code=404)
+
+    rows = await connections.get("default").execute_query_dict(
+        RESPONSE_TIMESERIES_SQL, [form.id, interval, start, end, tz_name]
+    )
+    return {
+        "interval": interval,
+        "timezone": tz_name,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "buckets": [
+            {"bucket": row["bucket"].replace(tzinfo=tz).isoformat(), "count": row["total"]}
+            for row in rows
+        ],
+    }
+
+
+def _parse_moment(value, tz):
+    if not value:
+        return None
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=tz)
+    return moment
+
+
+def _form_status(row, now):
+    if row["draft"]:
+        return "draft"
+    if not row["is_active"]:
+        return "inactive"
+    if row["active_until"] and row["active_until"] < now:
+        return "expired"
+    if row["max_response"] and row["response_count"] >= row["max_response"]:
+        return "full"
+    return "active"
+
+
+@analytics_router.get("/dashboard",
+                     summary="Get Overview of All the User's Forms",
+                     security=[{"bearerAuth": []}],
+                     responses={200: OwnerDashboard, 400: Error400})
+@auth(["jwt"])
+async def get_owner_dashboard(req: Request, res: Response):
+    now = datetime.now(UTC)
+    today = now.date()
+    rows = await connections.get("default").execute_query_dict(OWNER_DASHBOARD_SQL, [req.user.id, today])
+    return {
+        "trend_days": [(today - timedelta(days=offset)).isoformat() for offset in range(6, -1, -1)],
+        "forms": [
+            {
+                "id": str(row["id"]),
+                "title": row["title"],
+                "public_id": row["public_id"],
+                "responses_count": row["response_count"],
+                "last_submission_at": row["last_submission_at"].isoformat() if row["last_submission_at"] else None,
+                "status": _form_status(row, now),
+                "trend": [int(total) for total in row["trend"]],
+            }
+            for row in rows
+        ],
+    }
@@ -47,7 +47,7 @@ async def login(req :Request, res: Response):
     user = await User.filter(email = data.email).first()
     if not user:
         return res.json({"error":"User not found"},status_code=400)
-    if not user.check_password(data.password):
+    if not await user.check_password(data.password):
         return res.json({"error":"Invalid Password"},status_code=400)
     return {"token":create_jwt({
         "user_id":str(user.id),
@@ -123,6 +123,6 @@ async def reset_password(req :Request, res: Response):
         return res.json({"error":"password is required"}, status_code = 400)
     
     user :User = await obj.user 
-    user.set_password(password)
+    await user.set_password(password)
     await user.save()
     return {"Success":"Password Reset Successfully"}
\ No newline at end of file
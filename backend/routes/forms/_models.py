@@ -241,7 +241,18 @@ class FormCreate(BaseModel):
     })
 
 
-FormResponse = FormCreate
-FormFieldsResponse = FormFieldCreate
-FormSectionResponse = FormSectionCreate
-UpdateForm = make_optional(FormCreate)
\ No newline at end of file
+class FormFieldUpsert(FormFieldCreate):
+    id: Optional[UUID] = None  # set for fields that already exist
+
+class FormSectionUpsert(FormSectionCreate):
+    id: Optional[UUID] = None  # set for sections that already exist
+    fields: Optional[List[FormFieldUpsert]] = None
+
+class FormUpsert(FormCreate):
+    sections: List[FormSectionUpsert]
+
+UpdateForm = make_optional(FormUpsert)
+
+FormResponse = FormUpsert
+FormFieldsResponse = FormFieldUpsert
+FormSectionResponse = FormSectionUpsert
\ No newline at end of file
@@ -11,9 +11,15 @@ from tortoise.expressions import Q
 from utils.format_forms import format_form
 from tortoise.transactions import in_transaction
 from nexios.openapi import Query
+from utils.pagination import paginate, page_size, Page, InvalidCursor
+from utils.public_forms import invalidate_public_form
+from utils.template_catalog import template_changed
+from utils.form_sync import build_field, diff_form_tree
+from utils.form_tree import load_form_tree
 
 forms_router = Router(prefix="/v1/forms", tags=["v1", "forms"])
 
+
 @forms_router.post("/create", 
                    summary="Create New Form",
                    request_model=FormCreate,
@@ -25,7 +31,7 @@ async def create_form(req: Request, res: Response):
     
     form_data = FormCreate(**await req.json)
     
-    async with in_transaction():
+    async with in_transaction() as conn:
         form = await Forms.create(
             title=form_data.title,
             detail=form_data.detail,
@@ -42,30 +48,26 @@ async def create_form(req: Request, res: Response):
             secondary_school=form_data.secondary_color,  
             collect_email=form_data.collect_email,
             multi_response=form_data.multi_response,
-            
+            using_db=conn
         )
 
-        
+        # Ids are generated client-side (uuid4 defaults), so fields can point at
+        # their section by id before anything is written: one INSERT per table.
+        sections, fields = [], []
         for section_data in form_data.sections:
-            section = await FormSections.create(
-                form_ref=form,
+            section = FormSections(
+                form_ref_id=form.id,
                 title=section_data.title,
                 description=section_data.description,
                 order=section_data.order
             )
-            
-            if section_data.fields:
-                for field_data in section_data.fields:
-                    await FormFields.create(
-                        form_ref=form,
-                        section_ref=section,
-                        field_name=field_data.field_name,
-                        field_type=field_data.field_type,
-                        required=field_data.required,
-                        constraints=field_data.constraints,
-                        section=field_data.section,
-                        field_order=field_data.field_order
-                    )
+            sections.append(section)
+            fields.extend(build_field(form, section, field_data) for field_data in section_data.fields or [])
+
+        if sections:
+            await FormSections.bulk_create(sections, using_db=conn)
+        if fields:
+            await FormFields.bulk_create(fields, using_db=conn)
         
         return {"success": "Form created successfully", "form_id": str(form.id)}
             
@@ -74,20 +76,37 @@ async def create_form(req: Request, res: Response):
 @forms_router.get("/all", 
                   summary="List Forms",
                   security=[{"bearerAuth": []}],
-                  parameters=[Query(name="limit"), Query(name="offset")],
+                  parameters=[Query(name="limit"), Query(name="cursor"), Query(name="include_total"), Query(name="offset")],
                   responses={200: FormResponse, 400: Error400})
 @auth(["jwt"])
 async def list_forms(req: Request, res: Response):
+        """
+        Lists the user's forms, newest first. Pages are walked with the opaque
+        ``X-Next-Cursor``/``X-Prev-Cursor`` response headers passed back as
+        ``cursor``; ``offset`` is still honoured for older clients.
+        """
         user = req.user
-        limit = int(req.query_params.get("limit",20))
-        offset = int(req.query_params.get("offset",0))
-        forms = await Forms.filter(owner=user).order_by("-created_at").limit(limit).offset(offset).prefetch_related(
+        limit = page_size(req.query_params.get("limit"))
+        forms = Forms.filter(owner=user).prefetch_related(
             "sections",
             "sections__fields",
             "fields"
         )
 
-        return [{**await format_form(form), "responses_count": await form.responses.all().count()} for form in forms]
+        if "offset" in req.query_params:
+            offset = int(req.query_params.get("offset",0))
+            page = Page(await forms.order_by("-created_at").limit(limit).offset(offset), None, None)
+        else:
+            try:
+                page = await paginate(forms, req.query_params.get("cursor"), limit)
+            except InvalidCursor as exc:
+                return res.json({"error": str(exc)}, status_code=400)
+
+        total = await Forms.filter(owner=user).count() if req.query_params.get("include_total") else None
+        return res.json(
+            [{**await format_form(form), "responses_count": form.response_count} for form in page.items],
+            headers=page.headers(total),
+        )
 
 
 @forms_router.get("/{form_id}/details", 
@@ -123,12 +142,9 @@ async def update_form(req: Request, res: Response):
     user = req.user
     form_data = UpdateForm(**await req.json)
     
-    async with in_transaction():
-        form = await Forms.get_or_none(id=form_id, owner=user).prefetch_related(
-            "sections",
-            "sections__fields",
-            "fields"
-        )
+    async with in_transaction() as conn:
+        # Row lock: concurrent autosaves of the same form apply one after another
+        form = await Forms.filter(id=form_id, owner=user).select_for_update().using_db(conn).first()
         
         if not form:
             return res.status(404).json({"error": "Form not found"})
@@ -137,77 +153,16 @@ async def update_form(req: Request, res: Response):
             exclude_unset=True,
             exclude={"sections"}
         ))
-        await form.save()
+        await form.save(using_db=conn)
         
         if form_data.sections is not None:
-            existing_sections = {str(section.id): section for section in await form.sections.all()}
-            existing_fields = {}
-            
-            for section in existing_sections.values():
-                section_fields = {str(field.id): field for field in await section.fields.all()}
-                existing_fields.update(section_fields)
-            
-            for section_data in form_data.sections:
-                if hasattr(section_data, 'id') and section_data.id in existing_sections:
-                    section = existing_sections[section_data.id]
-                    section.title = section_data.title
-                    section.description = section_data.description
-                    section.order = section_data.order
-                    await section.save()
-                    
-                    if section_data.fields is not None:
-                        for field_data in section_data.fields:
-                            if hasattr(field_data, 'id') and field_data.id in existing_fields:
-                                field = existing_fields[field_data.id]
-                                field.field_name = field_data.field_name
-                                field.field_type = field_data.field_type
-                                field.required = field_data.required
-                                field.constraints = field_data.constraints
-                                field.section = field_data.section
-                                field.field_order = field_data.field_order
-                                await field.save()
-                                del existing_fields[field_data.id]
-                            else:
-                                await FormFields.create(
-                                    form_ref=form,
-                                    section_ref=section,
-                                    field_name=field_data.field_name,
-                                    field_type=field_data.field_type,
-                                    required=field_data.required,
-                                    constraints=field_data.constraints,
-                                    section=field_data.section,
-                                    field_order=field_data.field_order
-                                )
-                else:
-                    section = await FormSections.create(
-                        form_ref=form,
-                        title=section_data.title,
-                        description=section_data.description,
-                        order=section_data.order or 1
-                    )
-                    
-                    if section_data.fields is not None:
-                        for field_data in section_data.fields:
-                            await FormFields.create(
-                                form_ref=form,
-                                section_ref=section,
-                                field_name=field_data.field_name,
-                                field_type=field_data.field_type,
-                                required=field_data.required,
-                                constraints=field_data.constraints,
-                                section=field_data.section,
-                                field_order=field_data.field_order
-                            )
-            
-            # Delete fields that were removed
-            for field_id in existing_fields:
-                await FormFields.filter(id=field_id).delete()
-            
-            # Delete sections that were removed
-            for section_id in existing_sections:
-                if section_id not in [s.id for s in form_data.sections if hasattr(s, 'id')]:
-                    await FormSections.filter(id=section_id).delete()
+            tree = await load_form_tree(form)
+            await diff_form_tree(tree, form_data.sections).apply(using_db=conn)
     
+    # post_save already evicted it, but a respondent may have re-cached the
+    # old version before the transaction committed
+    invalidate_public_form(form.public_id)
+    template_changed(form)
     return {"success": "Form updated successfully"}
 
 
@@ -1,8 +1,14 @@
 from nexios.http import Request, Response
 from nexios.routing import Router
+from utils.cache import cache_stats
+from utils.passwords import password_pool
 
 index_router = Router()
 
+# Internal counters (cache keys, hit ratios, bcrypt queue times). Not public:
+# main.py only mounts this router when EXPOSE_METRICS is set.
+metrics_router = Router()
+
 
 @index_router.get("/")
 async def index(request: Request, response: Response):
@@ -10,3 +16,20 @@ async def index(request: Request, response: Response):
     Index route for the application.
     """
     return response.json({"message": "Welcome to the Nexios application!"})
+
+
+@metrics_router.get("/metrics/caches")
+async def caches_metrics(request: Request, response: Response):
+    """
+    Hit, miss and eviction counters of the in-process caches.
+    """
+    return response.json(cache_stats())
+
+
+
+@metrics_router.get("/metrics/passwords")
+async def passwords_metrics(request: Request, response: Response):
+    """
+    Size, queue time and run time of the password hashing pool.
+    """
+    return response.json(password_pool.stats())
\ No newline at end of file
@@ -2,24 +2,20 @@ from math import e
 from nexios.routing import Router
 from nexios.http import Request, Response
 from models import Forms
-from utils.format_forms import format_form
 from dto.responses import Success200, Error400
 from routes.forms._models import FormResponse
 from datetime import UTC, datetime
-from tortoise.expressions import Q
+from tortoise.transactions import in_transaction
 from models import Forms 
-from utils.pydantic_conv import create_model_from_form
+from utils.validator_cache import get_submission_validator
 from user_agents import parse
 from models.form_response import FormResponse
+from utils.rollups import record_responses
+from utils.ingest import submission_buffer, batch_ingest_enabled, IngestBusy
+from utils.public_forms import get_public_form as load_public_form, load_active_form, cached_form_data
+from nexios.http.response import BaseResponse
 
 public_router = Router(prefix="/v1/public", tags=["v1", "public"])
-async def get_active_forms():
-    now = datetime.now(UTC)
-
-    query = Q(draft=False) & Q(is_active=True) 
-
-    return  Forms.filter(query)
-
 def make_key_string_from_dict(dict):
     new_dict = {}
     for key, value in dict.items():
@@ -28,38 +24,28 @@ def make_key_string_from_dict(dict):
 
 @public_router.get("/{form_id}/details", responses={200: FormResponse, 400: Error400})
 async def get_public_form(req: Request, res: Response, form_id):
-    print(form_id)
-    activate_form = await get_active_forms()
-    form = await activate_form.filter(public_id=form_id).first()
-    if not form:
-        print("Form not found")
+    public_form = await load_public_form(form_id)
+    if not public_form or public_form.expired:
         return res.status(404).json({"error": "Form not found"},status_code=404)
 
-    if form.active_until and form.active_until < datetime.now(UTC):
-        print("expired")
-        print(form.active_until)
-        return res.status(404).json({"error": "Form not found"},status_code=404)
-    return await format_form(form)
+    headers = public_form.cache_headers()
+    if public_form.not_modified(req.headers.get("If-None-Match")):
+        return res.empty(status_code=304, headers=headers)
+    return res.make_response(BaseResponse(public_form.body, headers=headers, content_type="application/json"))
 
 
 @public_router.post("/{form_id}/submit", responses={200: Success200, 400: Error400})
 async def submit_form(req: Request, res: Response, form_id):
     print(req.client)
-    activate_form = await get_active_forms()
-    form = await activate_form.filter(public_id=form_id).first()
+    # Always the current row: another worker may have closed or edited the form
+    form = await load_active_form(form_id)
     if not form:
         return res.status(404).json({"error": "Form not found"},status_code=404)
 
     if form.active_until and form.active_until < datetime.now(UTC):
-        print("expired")
-        print(form.active_until)
         return res.status(404).json({"error": "Form not found"},status_code=404)
     
-    form_data = await format_form(form)
-    print(form_data)
-    print(form_data)
-    pydantic_model = create_model_from_form(form_data)
-    print("pydantic_model", pydantic_model)
+    pydantic_model = await get_submission_validator(form, cached_form_data(form))
     request_data = await req.json
     print("request_data", request_data)
     form_data = pydantic_model(**request_data)
@@ -69,10 +55,7 @@ async def submit_form(req: Request, res: Response, form_id):
     # print(user_agent.device.family)
     # print(user_agent.device.brand)
 
-    if form.max_response and await form.responses.all().count() > form.max_response:
-        return res.json({"error": "Response limit exceeded"},status_code=400)
-    
-    await FormResponse.create(
+    response = FormResponse(
         form_ref = form,
         device_browser = str(user_agent.browser.family),
         device_os = str(user_agent.os.family),
@@ -80,4 +63,27 @@ async def submit_form(req: Request, res: Response, form_id):
         device_brand = str(user_agent.device.brand),
         response = make_key_string_from_dict(form_data.dict()),
     )
-    return res.json({"success": "Form submitted successfully"},status_code=200) 
\ No newline at end of file
+    if batch_ingest_enabled():
+        if not await Forms.reserve_responses(form.id):
+            return res.json({"error": "Response limit exceeded"},status_code=400)
+        try:
+            submission_id = await submission_buffer.enqueue(response)
+        except IngestBusy:
+            await Forms.release_responses(form.id)
+            return res.json({"error": "Too many submissions, try again shortly"},status_code=503)
+        return res.json({"success": "Form submission accepted", "submission_id": str(submission_id)},status_code=202)
+
+    async with in_transaction() as conn:
+        if not await Forms.reserve_responses(form.id, using_db=conn):
+            return res.json({"error": "Response limit exceeded"},status_code=400)
+        await response.save(using_db=conn)
+        await record_responses([response], using_db=conn)
+    return res.json({"success": "Form submitted successfully"},status_code=200)
+
+
+@public_router.get("/{form_id}/submissions/{submission_id}", responses={200: None, 400: Error400})
+async def get_submission_status(req: Request, res: Response, form_id, submission_id):
+    status = submission_buffer.delivery_status(form_id, submission_id)
+    if not status:
+        return res.json({"error": "Submission not found"},status_code=404)
+    return status
\ No newline at end of file
@@ -2,26 +2,44 @@ from nexios.routing import Router
 from nexios.http import Request, Response
 from dto.responses import Success200, Error400
 from ._models import FormResponses
-from models.form_response import FormResponse
+from models.form_response import FormResponse, SERIALIZED_FIELDS
 from models.forms import Forms
 from nexios.auth.decorator import auth
-import csv
-import io
+from utils.exporters import export_form_responses, get_exporter, ExportFormatUnavailable
+from utils.export_jobs import export_jobs
+from utils.file_ranges import parse_range, iter_file, RangeNotSatisfiable
+from nexios.openapi import Query
+from utils.pagination import paginate, page_size, is_paged, InvalidCursor
+RESPONSES_PAGE_SIZE = 50
 responses_router = Router(prefix="/v1/responses", tags=["v1", "responses"])
 
 
 @responses_router.get("/{form_id}", 
     summary="Get Form Responses",
     security=[{"bearerAuth": []}],
+    parameters=[Query(name="limit"), Query(name="cursor")],
     responses={200: FormResponses, 400: Error400})
 async def get_form_responses(req: Request, res: Response, form_id):
     
-    form = await Forms.filter(id=form_id, owner = req.user).first().prefetch_related("responses")
+    form = await Forms.filter(id=form_id, owner = req.user).first()
     if not form:
         return res.json({"error": "Form not found"},status_code=404)
     
-    response = await form.responses.all().order_by("-created_at")
-    return [await form.to_dict() for form in response]    
+    if not is_paged(req.query_params):
+        rows = await FormResponse.filter(form_ref_id=form.id).order_by("-created_at", "-id").values(*SERIALIZED_FIELDS)
+        return res.json([FormResponse.row_to_dict(row) for row in rows], headers={"X-Total-Count": str(form.response_count)})
+
+    try:
+        page = await paginate(
+            FormResponse.filter(form_ref_id=form.id),
+            req.query_params.get("cursor"),
+            page_size(req.query_params.get("limit"), default=RESPONSES_PAGE_SIZE),
+            fields=SERIALIZED_FIELDS,
+        )
+    except InvalidCursor as exc:
+        return res.json({"error": str(exc)},status_code=400)
+
+    return res.json([FormResponse.row_to_dict(row) for row in page.items], headers=page.headers(form.response_count))
 
 
 
@@ -31,52 +49,94 @@ async def get_form_responses(req: Request, res: Response, form_id):
     responses={200: FormResponses, 400: Error400})
 async def get_form_response_detail(req: Request, res: Response, form_id, response_id):
     
-    form = await Forms.filter(id=form_id, owner = req.user).first().prefetch_related("responses")
-    if not form:
-        return res.json({"error": "Form not found"},status_code=404)
-    
-    response = await form.responses.filter(id=response_id).first()
+    response = await FormResponse.filter(
+        id=response_id, form_ref_id=form_id, form_ref__owner=req.user
+    ).first()
     if not response:
         return res.json({"error": "Response not found"},status_code=404)
     
-    return await response.to_dict()
+    return response.to_dict()
 
 @responses_router.get("/download/{form_id}", 
-    summary="Download Form Response as CSV",
+    summary="Download Form Responses (csv, ndjson, parquet or xlsx)",
     security=[{"bearerAuth": []}],
+    parameters=[Query(name="format"), Query(name="gzip")],
     responses={200: None, 400: Error400})
 async def download_form_responses(req: Request, res: Response, form_id):
-    print("======")
-    print("form_id", form_id)
-  
-    
-    form = await Forms.filter(id=form_id, owner=req.user).first().prefetch_related("responses")
+    form = await Forms.filter(id=form_id, owner=req.user).first()
     if not form:
         return res.json({"error": "Form not found"}, status_code=404)
 
-    fields = await form.fields.all()
-    responses = await form.responses.all()
-    
-    buffer = io.StringIO()
-    writer = csv.writer(buffer)
+    export_format = req.query_params.get("format", "csv").lower()
+    gzip = req.query_params.get("gzip", "false").lower() in ("1", "true", "yes")
+    try:
+        body, content_type, filename = await export_form_responses(form, export_format, gzip=gzip)
+    except ExportFormatUnavailable as exc:
+        return res.json({"error": str(exc)}, status_code=400)
 
-    writer.writerow([f"Form Title: {form.title}"])
-    writer.writerow([])  
+    res.stream(body, content_type=content_type)
+    res.set_header("Content-Disposition", f"attachment; filename={filename}")
+    return res
 
-    fieldnames = [x.field_name for x in fields]
-    if form.collect_email:
-        fieldnames.insert(0, "Email")
-    dict_writer = csv.DictWriter(buffer, fieldnames=fieldnames)
-    dict_writer.writeheader()
 
-    for resp in responses:
-        print("="* 20)
-        print("resp", resp.response)
-        writer.writerow({**resp.response})
+@responses_router.post("/{form_id}/exports",
+    summary="Start a Background Export",
+    security=[{"bearerAuth": []}],
+    parameters=[Query(name="format"), Query(name="gzip")],
+    responses={202: None, 400: Error400})
+@auth(["jwt"])
+async def create_export(req: Request, res: Response, form_id):
+    form = await Forms.filter(id=form_id, owner=req.user).first()
+    if not form:
+        return res.json({"error": "Form not found"}, status_code=404)
+
+    export_format = req.query_params.get("format", "csv").lower()
+    gzip = req.query_params.get("gzip", "false").lower() in ("1", "true", "yes")
+    try:
+        get_exporter(export_format)
+    except ExportFormatUnavailable as exc:
+        return res.json({"error": str(exc)}, status_code=400)
+
+    job = export_jobs.start(form, export_format, gzip=gzip)
+    return res.json(job.to_dict(), status_code=202)
+
+
+@responses_router.get("/exports/{job_id}",
+    summary="Get Export Progress",
+    security=[{"bearerAuth": []}],
+    responses={200: None, 400: Error400})
+@auth(["jwt"])
+async def get_export(req: Request, res: Response, job_id):
+    job = export_jobs.get(job_id)
+    if not job or job.owner_id != str(req.user.id):
+        return res.json({"error": "Export not found"}, status_code=404)
+    return job.to_dict()
+
+
+@responses_router.get("/exports/{job_id}/download",
+    summary="Download a Finished Export (supports Range)",
+    security=[{"bearerAuth": []}],
+    responses={200: None, 206: None, 400: Error400})
+@auth(["jwt"])
+async def download_export(req: Request, res: Response, job_id):
+    job = export_jobs.get(job_id)
+    if not job or job.owner_id != str(req.user.id):
+        return res.json({"error": "Export not found"}, status_code=404)
+    if job.status != "completed":
+        return res.json({"error": "Export is not ready", "status": job.status}, status_code=409)
 
-    buffer.seek(0)
+    size = job.bytes_written
+    try:
+        byte_range = parse_range(req.headers.get("Range"), size)
+    except RangeNotSatisfiable:
+        res.set_header("Content-Range", f"bytes */{size}")
+        return res.json({"error": "Requested range not satisfiable"}, status_code=416)
 
-    return res.resp(buffer.read(), headers={
-        "Content-Type": "text/csv",
-        "Content-Disposition": f"attachment; filename={form.title}.csv"
-    })
\ No newline at end of file
+    start, end = byte_range or (0, size - 1)
+    res.stream(iter_file(job.path, start, end), content_type=job.content_type, status_code=206 if byte_range else 200)
+    res.set_header("Accept-Ranges", "bytes")
+    res.set_header("Content-Length", str(end - start + 1))
+    res.set_header("Content-Disposition", f"attachment; filename={job.filename}")
+    if byte_range:
+        res.set_header("Content-Range", f"bytes {start}-{end}/{size}")
+    return res
@@ -0,0 +1,45 @@
+"""
+Raw SQL used to instantiate templates.
+
+A template is copied with one INSERT ... SELECT per table, so the cost does
+not depend on the number of sections and fields. New section and field ids
+are derived from the old id and the new form id ($2) with md5, which lets the
+field copy point at the copied sections without a lookup table.
+"""
+
+# $1 template id, $2 new form id, $3 owner id, $4 public_id. Returns no row
+# when $1 is not a published template.
+COPY_TEMPLATE_FORM_SQL = """
+INSERT INTO "forms" (
+    "id", "title", "detail", "logo", "cover_image", "owner_id", "max_response", "is_active",
+    "as_template", "tag", "active_until", "public_template", "company_website", "draft",
+    "primary_color", "secondary_school", "collect_email", "multi_response", "public_id", "response_count"
+)
+SELECT
+    $2::uuid, t."title", t."detail", t."logo", t."cover_image", $3, t."max_response", t."is_active",
+    FALSE, t."tag", t."active_until", t."public_template", t."company_website", TRUE,
+    t."primary_color", t."secondary_school", t."collect_email", t."multi_response", $4, 0
+FROM "forms" t
+WHERE t."id" = $1 AND t."as_template" AND NOT t."draft"
+RETURNING "id"
+"""
+
+COPY_TEMPLATE_SECTIONS_SQL = """
+INSERT INTO "form_sections" ("id", "form_ref_id", "title", "description", "order")
+SELECT md5($2::uuid::text || s."id"::text)::uuid, $2::uuid, s."title", s."description", s."order"
+FROM "form_sections" s
+WHERE s."form_ref_id" = $1
+"""
+
+COPY_TEMPLATE_FIELDS_SQL = """
+INSERT INTO "Form Fields" (
+    "id", "form_ref_id", "section_ref_id", "field_order", "field_name", "field_type",
+    "required", "constraints", "section"
+)
+SELECT
+    md5($2::uuid::text || f."id"::text)::uuid, $2::uuid,
+    md5($2::uuid::text || f."section_ref_id"::text)::uuid,
+    f."field_order", f."field_name", f."field_type", f."required", f."constraints", f."section"
+FROM "Form Fields" f
+WHERE f."form_ref_id" = $1
+"""
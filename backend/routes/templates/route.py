@@ -3,21 +3,37 @@ from nexios import Router
 from nexios.http import Request, Response
 from dto.responses import Success200, Error400
 from models import Forms
-from utils.format_forms import format_form_template,FormTemplateResponse,FormResponse
+from utils.format_forms import FormTemplateResponse,FormResponse
 from typing import List
 from nexios.auth.decorator import auth
 from models.form_fields import FormFields
 from models.form_sections import FormSections
 from ._models import TemplateResponse
 from utils.format_forms import format_form
+from utils.pagination import page_size, is_paged, InvalidCursor
+from utils.template_catalog import template_catalog
+from nexios.openapi import Query
+from uuid import UUID, uuid4
+from tortoise.exceptions import IntegrityError
+from tortoise.transactions import in_transaction
+from utils.public_ids import PUBLIC_ID_MAX_ATTEMPTS, generate_public_id, is_public_id_conflict
+from ._queries import COPY_TEMPLATE_FORM_SQL, COPY_TEMPLATE_SECTIONS_SQL, COPY_TEMPLATE_FIELDS_SQL
 templates_router = Router("/v1/templates", tags=["Templates"])
 
 
-@templates_router.get("/list", responses=List[FormTemplateResponse])
+@templates_router.get("/list", responses=List[FormTemplateResponse],
+                      parameters=[Query(name="limit"), Query(name="cursor"), Query(name="include_total")])
 async def get_templates(req: Request, res: Response):
-    templates = await Forms.filter(as_template=True, draft=False).order_by("-created_at")
+    if not is_paged(req.query_params):
+        return res.json(await template_catalog.all())
 
-    return [await format_form_template(form) for form in templates]
+    try:
+        page = await template_catalog.page(req.query_params.get("cursor"), page_size(req.query_params.get("limit")))
+    except InvalidCursor as exc:
+        return res.json({"error": str(exc)}, status_code=400)
+
+    total = await template_catalog.total() if req.query_params.get("include_total") else None
+    return res.json(page.items, headers=page.headers(total))
 
 
 
@@ -25,47 +41,32 @@ async def get_templates(req: Request, res: Response):
 @templates_router.post("/{id}/use", responses=TemplateResponse, security=[{"bearerAuth": []}])
 @auth(["jwt"])
 async def use_template(req: Request, res: Response):
-    obj_id = req.path_params.get("id")
-
-    # Fetch the form template
-    old_obj = await Forms.filter(as_template=True, draft=False, id=obj_id).prefetch_related("fields").first()
-    if not old_obj:
+    try:
+        obj_id = UUID(req.path_params.get("id"))
+    except ValueError:
         return res.json({"error": "Template Response", "message": "Template Not Found"})
 
-    fields_to_copy = old_obj._meta.fields_map.keys()
-    form_data = {field: getattr(old_obj, field) for field in fields_to_copy if field != "id"}
-    form_data.pop("sections");form_data.pop("fields");form_data.pop("owner");form_data.pop("responses")
-    form_data["as_template"] = False
-    form_data["draft"] = True
-    form_data["public_id"] = old_obj.generate_public_id()
-
-    new_obj = await Forms.create(**form_data)
-    new_obj.owner = req.user
-    await new_obj.save()
-    for section in await old_obj.sections.all():
-        section_fields = section._meta.fields_map.keys()
-        section_data = {f: getattr(section, f) for f in section_fields if f != "id"}
-        section_data.pop("form_ref"); section_data.pop("fields")
-
-        new_section = await FormSections.create(**section_data)
-        new_section.form_ref = new_obj
-        new_section.order = section.order
-        await new_section.save()
-
-        for field in await section.fields.all():
-            field_fields = field._meta.fields_map.keys()
-            field_data = {f: getattr(field, f) for f in field_fields if f != "id"}
-            field_data.pop("form_ref"); field_data.pop("section_ref")
-
-            new_field = await FormFields.create(**field_data)
-            new_field.form_ref = new_obj
-            new_field.section_ref = new_section
-            await new_field.save()
-
+    # Copy the form, its sections and its fields with one statement each; a
+    # retry only happens if the generated public_id is already taken.
+    new_id = uuid4()
+    for attempt in range(PUBLIC_ID_MAX_ATTEMPTS):
+        try:
+            async with in_transaction() as conn:
+                _, rows = await conn.execute_query(
+                    COPY_TEMPLATE_FORM_SQL, [obj_id, new_id, req.user.id, generate_public_id()]
+                )
+                if not rows:
+                    return res.json({"error": "Template Response", "message": "Template Not Found"})
+                await conn.execute_query(COPY_TEMPLATE_SECTIONS_SQL, [obj_id, new_id])
+                await conn.execute_query(COPY_TEMPLATE_FIELDS_SQL, [obj_id, new_id])
+            break
+        except IntegrityError as exc:
+            if not is_public_id_conflict(exc) or attempt == PUBLIC_ID_MAX_ATTEMPTS - 1:
+                raise
+
+    return {"form_id": new_id}
 
-    return {"form_id": new_obj.id}
 
-     
 @templates_router.get("/{id}/preview", responses=FormResponse, security=[{"bearerAuth": []}])
 @auth(["jwt"])
 async def preview_template(req: Request, res: Response):
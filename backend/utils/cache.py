@@ -0,0 +1,102 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+_registry: Dict[str, "LRUCache"] = {}
+
+
+class LRUCache:
+    """
+    A small in-process LRU cache with hit/miss/eviction counters.
+
+    Entries are evicted least-recently-used first once either ``max_entries``
+    or ``max_weight`` (the sum of the weights passed to ``set``) is exceeded,
+    and expire ``ttl`` seconds after they were set when a TTL is given.
+    Every named cache is registered so its counters can be read through
+    ``cache_stats``.
+
+    Args:
+        name (str): Name used in ``cache_stats``.
+        max_entries (int): Maximum number of entries kept.
+        max_weight (int, optional): Maximum total weight kept, ``None`` for no cap.
+        ttl (float, optional): Default lifetime of an entry in seconds, ``None`` for no expiry.
+    """
+
+    def __init__(self, name: str, max_entries: int = 1024, max_weight: Optional[int] = None,
+                 ttl: Optional[float] = None):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_weight = max_weight
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[Any, int, Optional[float]]]" = OrderedDict()
+        self._weight = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        _registry[name] = self
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable, default: Any = None, is_stale: Optional[Callable[[Any], bool]] = None) -> Any:
+        """
+        Returns the cached value for ``key`` and marks it as recently used.
+
+        If the entry has expired, or ``is_stale`` is given and returns ``True``
+        for the cached value, the entry is dropped and the lookup counts as a miss.
+        """
+        entry = self._data.get(key)
+        expired = entry is not None and entry[2] is not None and entry[2] <= time.monotonic()
+        if entry is None or expired or (is_stale is not None and is_stale(entry[0])):
+            if entry is not None:
+                self.pop(key)
+                self.expirations += expired
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def set(self, key: Hashable, value: Any, weight: int = 1, ttl: Optional[float] = None) -> None:
+        """Stores ``value``; ``ttl`` overrides the cache's default lifetime for this entry."""
+        self.pop(key)
+        ttl = self.ttl if ttl is None else ttl
+        self._data[key] = (value, weight, time.monotonic() + ttl if ttl is not None else None)
+        self._weight += weight
+        while self._data and (
+            len(self._data) > self.max_entries
+            or (self.max_weight is not None and self._weight > self.max_weight)
+        ):
+            _, (_, evicted_weight, _) = self._data.popitem(last=False)
+            self._weight -= evicted_weight
+            self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return default
+        self._weight -= entry[1]
+        return entry[0]
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._weight = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._data),
+            "weight": self._weight,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+def cache_stats() -> Dict[str, Dict[str, int]]:
+    """Returns the counters of every registered cache, keyed by cache name."""
+    return {name: cache.stats() for name, cache in _registry.items()}
@@ -0,0 +1,50 @@
+"""
+Rebuilds the denormalized ``Forms.response_count`` column from ``FormResponse``.
+
+Run it from the backend directory whenever the counters may have drifted:
+
+    python -m utils.counters [form_id ...]
+"""
+import asyncio
+import sys
+from typing import Optional, Sequence
+from tortoise import Tortoise, connections
+
+RECONCILE_SQL = """
+UPDATE "forms" SET "response_count" = (
+    SELECT COUNT(*) FROM "formresponse" WHERE "formresponse"."form_ref_id" = "forms"."id"
+)
+"""
+
+
+async def reconcile_response_counts(form_ids: Optional[Sequence[str]] = None) -> int:
+    """
+    Recomputes ``response_count`` for the given forms, or for every form.
+
+    Args:
+        form_ids (list, optional): Ids of the forms to rebuild. All forms when omitted.
+
+    Returns:
+        int: The number of forms updated.
+    """
+    db = connections.get("default")
+    if form_ids:
+        rows, _ = await db.execute_query(RECONCILE_SQL + 'WHERE "forms"."id" = ANY($1::uuid[])', [list(form_ids)])
+    else:
+        rows, _ = await db.execute_query(RECONCILE_SQL)
+    return rows
+
+
+async def main(form_ids: Sequence[str]) -> None:
+    from config import db_config
+
+    await Tortoise.init(config=db_config)
+    try:
+        updated = await reconcile_response_counts(form_ids)
+        print(f"Reconciled response counts for {updated} form(s)")
+    finally:
+        await connections.close_all()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:]))
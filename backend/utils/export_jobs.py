@@ -0,0 +1,154 @@
+import asyncio
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from uuid import uuid4
+from nexios.logging import getLogger
+from models import Forms
+from .exporters import export_form_responses
+
+logger = getLogger(__name__)
+
+EXPORT_DIR = os.getenv("EXPORT_DIR", os.path.join(tempfile.gettempdir(), "formably-exports"))
+EXPORT_MAX_ARTIFACTS = int(os.getenv("EXPORT_MAX_ARTIFACTS", 64))
+
+PENDING = "pending"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+class ExportJob:
+    """A single background export of a form's responses to a local file."""
+
+    def __init__(self, form: Forms, format: str, gzip: bool):
+        self.id = uuid4().hex
+        self.form_id = str(form.id)
+        self.owner_id = str(form.owner_id)
+        self.format = format
+        self.gzip = gzip
+        # The artifact is reusable for as long as no response was added and the form was not edited
+        self.fingerprint = (form.response_count, form.updated_at)
+        self.total_rows = form.response_count
+        self.rows_written = 0
+        self.bytes_written = 0
+        self.status = PENDING
+        self.error: Optional[str] = None
+        self.path: Optional[str] = None
+        self.filename: Optional[str] = None
+        self.content_type: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def key(self) -> Tuple[str, str, bool]:
+        return (self.form_id, self.format, self.gzip)
+
+    def to_dict(self) -> Dict[str, Any]:
+        progress = 1.0 if self.status == COMPLETED else (
+            min(self.rows_written / self.total_rows, 1.0) if self.total_rows else 0.0
+        )
+        return {
+            "id": self.id,
+            "form_id": self.form_id,
+            "format": self.format,
+            "gzip": self.gzip,
+            "status": self.status,
+            "rows_written": self.rows_written,
+            "total_rows": self.total_rows,
+            "progress": round(progress, 4),
+            "size": self.bytes_written,
+            "filename": self.filename,
+            "error": self.error,
+        }
+
+    def _count(self, rows: int) -> None:
+        self.rows_written += rows
+
+    async def run(self, form: Forms) -> None:
+        self.status = RUNNING
+        partial = os.path.join(EXPORT_DIR, f"{self.id}.part")
+        try:
+            body, self.content_type, self.filename = await export_form_responses(
+                form, self.format, gzip=self.gzip, on_rows=self._count
+            )
+            await asyncio.to_thread(os.makedirs, EXPORT_DIR, exist_ok=True)
+            handle = await asyncio.to_thread(open, partial, "wb")
+            try:
+                async for chunk in body:
+                    await asyncio.to_thread(handle.write, chunk)
+                    self.bytes_written += len(chunk)
+            finally:
+                await asyncio.to_thread(handle.close)
+            self.path = os.path.join(EXPORT_DIR, self.id)
+            await asyncio.to_thread(os.replace, partial, self.path)
+            self.status = COMPLETED
+        except Exception as exc:
+            logger.error(f"Export {self.id} of form {self.form_id} failed: {exc}")
+            self.status = FAILED
+            self.error = str(exc)
+            if os.path.exists(partial):
+                os.remove(partial)
+        finally:
+            self.finished_at = time.time()
+
+    def discard(self) -> None:
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class ExportJobManager:
+    """
+    Runs export jobs in the background and keeps their artifacts around.
+
+    Only one job exists per ``(form, format, gzip)``: a new request for the
+    same export joins the job that is already running, or reuses the finished
+    artifact when the form has neither new responses nor edits since it was
+    built. At most ``max_artifacts`` jobs are kept; the oldest files go first.
+    """
+
+    def __init__(self, max_artifacts: int = EXPORT_MAX_ARTIFACTS):
+        self.max_artifacts = max_artifacts
+        self._jobs: Dict[str, ExportJob] = {}
+        self._latest: "OrderedDict[Tuple[str, str, bool], ExportJob]" = OrderedDict()
+
+    def get(self, job_id: str) -> Optional[ExportJob]:
+        return self._jobs.get(job_id)
+
+    def start(self, form: Forms, format: str, gzip: bool = False) -> ExportJob:
+        """
+        Returns the job producing this export, starting a new one only if there
+        is neither a running job nor a still-valid artifact for it.
+        """
+        key = (str(form.id), format, gzip)
+        current = self._latest.get(key)
+        if current is not None and current.status != FAILED and (
+            current.status in (PENDING, RUNNING) or current.fingerprint == (form.response_count, form.updated_at)
+        ):
+            self._latest.move_to_end(key)
+            return current
+
+        job = ExportJob(form, format, gzip)
+        if current is not None:
+            self._forget(current)
+        self._jobs[job.id] = job
+        self._latest[key] = job
+        job.task = asyncio.create_task(job.run(form))
+        while len(self._latest) > self.max_artifacts:
+            _, oldest = self._latest.popitem(last=False)
+            self._forget(oldest)
+        return job
+
+    def _forget(self, job: ExportJob) -> None:
+        self._jobs.pop(job.id, None)
+        if self._latest.get(job.key) is job:
+            del self._latest[job.key]
+        job.discard()
+
+
+export_jobs = ExportJobManager()
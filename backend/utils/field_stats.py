@@ -0,0 +1,187 @@
+import os
+import warnings
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+from models import Forms
+from models.form_fields import FieldTypeEnum
+from .cache import LRUCache
+from .exporters import coerce
+from .form_tree import load_form_tree
+from .response_reader import iter_response_chunks
+
+CHOICE_TYPES = {FieldTypeEnum.SELECT, FieldTypeEnum.RADIO}
+MULTI_CHOICE_TYPES = {FieldTypeEnum.CHECKBOX, FieldTypeEnum.MULTISELEC}
+NUMERIC_TYPES = {FieldTypeEnum.NUMBER, FieldTypeEnum.INTEGER, FieldTypeEnum.SCALE}
+DATE_TYPES = {FieldTypeEnum.DATE, FieldTypeEnum.DATETIME}
+
+PERCENTILES = (5, 25, 50, 75, 95)
+HISTOGRAM_BINS = 10
+FIELD_STATS_CHUNK_SIZE = int(os.getenv("FIELD_STATS_CHUNK_SIZE", 5000))
+
+# form id -> ((response_count, updated_at), stats). A new submission bumps
+# response_count, which makes the cached entry stale.
+field_stats_cache = LRUCache("field_stats", max_entries=int(os.getenv("FIELD_STATS_CACHE_SIZE", 256)))
+
+_MISSING = np.array([None, "None", ""], dtype=object)
+
+
+def _answered(values: np.ndarray) -> np.ndarray:
+    """Drops missing answers (``None``, ``"None"`` and ``""``) from an object array."""
+    return values[~np.isin(values, _MISSING)]
+
+
+def _to_float_array(values: np.ndarray, field_type: FieldTypeEnum) -> np.ndarray:
+    try:
+        parsed = values.astype(np.float64)
+    except (TypeError, ValueError):
+        # Fall back element-wise only for chunks holding unparsable answers
+        parsed = np.array([coerce(value, field_type) for value in values], dtype=object)
+        parsed = parsed[parsed != None].astype(np.float64)  # noqa: E711
+    # "nan" and "inf" parse but would break the histogram and the mean
+    return parsed[np.isfinite(parsed)]
+
+
+def _to_datetime_array(values: np.ndarray, field_type: FieldTypeEnum) -> np.ndarray:
+    unit = "D" if field_type == FieldTypeEnum.DATE else "s"
+    try:
+        with warnings.catch_warnings():
+            # Answers carry "+00:00" offsets; NumPy converts them to UTC but warns
+            warnings.simplefilter("ignore", UserWarning)
+            return values.astype(f"datetime64[{unit}]")
+    except (TypeError, ValueError):
+        parsed = [coerce(value, field_type) for value in values]
+        parsed = [value.replace(tzinfo=None) if hasattr(value, "tzinfo") else value for value in parsed if value is not None]
+        return np.array(parsed, dtype=f"datetime64[{unit}]")
+
+
+class _FieldAccumulator:
+    """Collects the answers of one field chunk by chunk as NumPy arrays."""
+
+    def __init__(self, name: str, field_type: FieldTypeEnum):
+        self.name = name
+        self.field_type = field_type
+        self.answered = 0
+        # Answers given but not parsable as the field's type; they are left
+        # out of ``stats``
+        self.invalid = 0
+        self.choices: Counter = Counter()
+        self.arrays: List[np.ndarray] = []
+
+    def add(self, values: np.ndarray) -> None:
+        values = _answered(values)
+        self.answered += len(values)
+        if not len(values):
+            return
+        if self.field_type in CHOICE_TYPES:
+            self._count(values.astype(str))
+        elif self.field_type in MULTI_CHOICE_TYPES:
+            lists = [coerce(value, self.field_type) for value in values]
+            self.invalid += lists.count(None)
+            self._count(np.array([item for items in lists if items for item in items], dtype=str))
+        elif self.field_type in NUMERIC_TYPES:
+            self._collect(values, _to_float_array(values, self.field_type))
+        elif self.field_type in DATE_TYPES:
+            self._collect(values, _to_datetime_array(values, self.field_type))
+
+    def _collect(self, values: np.ndarray, parsed: np.ndarray) -> None:
+        self.invalid += len(values) - len(parsed)
+        self.arrays.append(parsed)
+
+    def _count(self, values: np.ndarray) -> None:
+        if len(values):
+            choices, counts = np.unique(values, return_counts=True)
+            self.choices.update(dict(zip(choices.tolist(), counts.tolist())))
+
+    def result(self) -> Dict[str, Any]:
+        stats: Optional[Dict[str, Any]] = None
+        if self.field_type in CHOICE_TYPES | MULTI_CHOICE_TYPES:
+            stats = {"distribution": dict(self.choices.most_common())}
+        elif self.field_type in NUMERIC_TYPES:
+            stats = self._numeric_stats()
+        elif self.field_type in DATE_TYPES:
+            stats = self._date_stats()
+        return {
+            "field_name": self.name,
+            "field_type": self.field_type.value,
+            "answered": self.answered,
+            "invalid": self.invalid,
+            "stats": stats,
+        }
+
+    def _numeric_stats(self) -> Optional[Dict[str, Any]]:
+        values = np.concatenate(self.arrays) if self.arrays else np.empty(0)
+        if not len(values):
+            return None
+        if self.field_type == FieldTypeEnum.SCALE:
+            points, counts = np.unique(values, return_counts=True)
+            histogram = {"bins": points.tolist(), "counts": counts.tolist()}
+        else:
+            counts, edges = np.histogram(values, bins=HISTOGRAM_BINS)
+            histogram = {"bins": edges.tolist(), "counts": counts.tolist()}
+        return {
+            "min": float(values.min()),
+            "max": float(values.max()),
+            "mean": float(values.mean()),
+            "percentiles": {
+                f"p{point}": float(value)
+                for point, value in zip(PERCENTILES, np.percentile(values, PERCENTILES))
+            },
+            "histogram": histogram,
+        }
+
+    def _date_stats(self) -> Optional[Dict[str, Any]]:
+        values = np.concatenate(self.arrays) if self.arrays else np.empty(0, dtype="datetime64[s]")
+        if not len(values):
+            return None
+        days, counts = np.unique(values.astype("datetime64[D]"), return_counts=True)
+        return {
+            "min": str(values.min()),
+            "max": str(values.max()),
+            "histogram": dict(zip(days.astype(str).tolist(), counts.tolist())),
+        }
+
+
+async def compute_field_stats(form: Forms, chunk_size: int = FIELD_STATS_CHUNK_SIZE) -> List[Dict[str, Any]]:
+    """
+    Computes per-field answer statistics of a form.
+
+    Responses are read in keyset chunks; each chunk is turned into one object
+    array per field and aggregated with NumPy (``np.unique``, ``np.histogram``,
+    ``np.percentile``) instead of row-by-row Python bookkeeping.
+
+    Args:
+        form (Forms): The form whose answers are summarised.
+        chunk_size (int): Responses read per database round trip.
+
+    Returns:
+        list: One dict per field with ``field_name``, ``field_type``, ``answered``,
+        ``invalid`` (answers that do not parse as the field's type, counted in
+        ``answered`` but not in ``stats``) and ``stats``.
+    """
+    tree = await load_form_tree(form)
+    fields = [field for _, section_fields in tree.sections for field in section_fields] + tree.orphan_fields
+    accumulators = {
+        field.field_name: _FieldAccumulator(field.field_name, FieldTypeEnum(field.field_type))
+        for field in fields
+    }
+    names: Sequence[str] = list(accumulators)
+
+    async for rows in iter_response_chunks(form.id, chunk_size=chunk_size, columns=("response",)):
+        answers = [row["response"] or {} for row in rows]
+        for name in names:
+            column = np.array([answer.get(name) for answer in answers], dtype=object)
+            accumulators[name].add(column)
+
+    return [accumulator.result() for accumulator in accumulators.values()]
+
+
+async def get_field_stats(form: Forms) -> List[Dict[str, Any]]:
+    """Returns ``compute_field_stats`` for a form, cached until its next submission or edit."""
+    version = (form.response_count, form.updated_at)
+    cached = field_stats_cache.get(form.id, is_stale=lambda entry: entry[0] != version)
+    if cached is not None:
+        return cached[1]
+    stats = await compute_field_stats(form)
+    field_stats_cache.set(form.id, (version, stats))
+    return stats
@@ -0,0 +1,51 @@
+import asyncio
+from typing import AsyncIterator, Optional, Tuple
+
+
+class RangeNotSatisfiable(Exception):
+    """Raised for a ``Range`` header that does not overlap the file."""
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parses a single-range ``Range: bytes=...`` header against a file size.
+
+    Returns the inclusive ``(start, end)`` byte positions, or ``None`` when
+    the whole file should be sent (no header, a multi-range or a non-byte
+    range, which servers are allowed to ignore).
+
+    Raises:
+        RangeNotSatisfiable: If the range lies outside the file.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    start_text, _, end_text = header[len("bytes="):].strip().partition("-")
+    try:
+        if not start_text:  # suffix range: the last N bytes
+            length = int(end_text)
+            if length <= 0:
+                raise RangeNotSatisfiable(header)
+            return max(size - length, 0), size - 1
+        start = int(start_text)
+        end = int(end_text) if end_text else size - 1
+    except ValueError:
+        return None
+    if start >= size or end < start:
+        raise RangeNotSatisfiable(header)
+    return start, min(end, size - 1)
+
+
+async def iter_file(path: str, start: int, end: int, chunk_size: int = 256 * 1024) -> AsyncIterator[bytes]:
+    """Reads ``path`` from ``start`` to ``end`` (inclusive) without blocking the event loop."""
+    handle = await asyncio.to_thread(open, path, "rb")
+    try:
+        await asyncio.to_thread(handle.seek, start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = await asyncio.to_thread(handle.read, min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        await asyncio.to_thread(handle.close)
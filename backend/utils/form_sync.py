@@ -0,0 +1,142 @@
+"""
+Applies an edited section/field tree to a stored form.
+
+``diff_form_tree`` compares the tree sent by the form builder with the stored
+one in a single pass and sorts every row into insert, update or delete.
+``FormTreeDiff.apply`` then writes the changes with a fixed number of
+statements (at most one bulk insert, one bulk update and one delete per
+table), however large the form is.
+"""
+from typing import Any, Dict, List, Optional, Sequence
+from uuid import UUID
+from tortoise.backends.base.client import BaseDBAsyncClient
+from models import Forms, FormSections, FormFields
+from .form_tree import FormTree
+
+SECTION_COLUMNS = ("title", "description", "order")
+FIELD_COLUMNS = ("section_ref_id", "field_name", "field_type", "required", "constraints", "section", "field_order")
+
+
+def build_field(form: Forms, section: FormSections, field_data: Any) -> FormFields:
+    """
+    Builds (without saving) the FormFields row for a submitted field.
+
+    ``section`` may itself be unsaved (it is bulk-created first), so the row
+    points at it by id: Tortoise refuses an unsaved instance as a relation.
+    """
+    return FormFields(
+        form_ref_id=form.id,
+        section_ref_id=section.id,
+        field_name=field_data.field_name,
+        field_type=field_data.field_type,
+        required=field_data.required,
+        constraints=field_data.constraints,
+        section=field_data.section,
+        field_order=field_data.field_order
+    )
+
+
+def _assign(obj: Any, values: Dict[str, Any]) -> bool:
+    """Sets ``values`` on ``obj`` and returns whether anything changed."""
+    changed = False
+    for name, value in values.items():
+        if getattr(obj, name) != value:
+            setattr(obj, name, value)
+            changed = True
+    return changed
+
+
+class FormTreeDiff:
+    """Rows to insert, update and delete to turn a stored tree into the submitted one."""
+
+    __slots__ = ("new_sections", "changed_sections", "deleted_section_ids",
+                 "new_fields", "changed_fields", "deleted_field_ids")
+
+    def __init__(self):
+        self.new_sections: List[FormSections] = []
+        self.changed_sections: List[FormSections] = []
+        self.deleted_section_ids: List[UUID] = []
+        self.new_fields: List[FormFields] = []
+        self.changed_fields: List[FormFields] = []
+        self.deleted_field_ids: List[UUID] = []
+
+    async def apply(self, using_db: Optional[BaseDBAsyncClient] = None) -> None:
+        # Sections first so new and moved fields can reference them; deletions
+        # last, once moved fields no longer point at a removed section.
+        if self.new_sections:
+            await FormSections.bulk_create(self.new_sections, using_db=using_db)
+        if self.changed_sections:
+            await FormSections.bulk_update(self.changed_sections, fields=SECTION_COLUMNS, using_db=using_db)
+        if self.new_fields:
+            await FormFields.bulk_create(self.new_fields, using_db=using_db)
+        if self.changed_fields:
+            await FormFields.bulk_update(self.changed_fields, fields=FIELD_COLUMNS, using_db=using_db)
+        if self.deleted_field_ids:
+            await FormFields.filter(id__in=self.deleted_field_ids).using_db(using_db).delete()
+        if self.deleted_section_ids:
+            await FormSections.filter(id__in=self.deleted_section_ids).using_db(using_db).delete()
+
+
+def diff_form_tree(tree: FormTree, sections_data: Sequence[Any]) -> FormTreeDiff:
+    """
+    Diffs submitted sections against the stored tree of a form.
+
+    Sections and fields are matched by ``id``; ids that do not belong to this
+    form are ignored and the row is created with a fresh id. Only the
+    attributes a section sends are updated. A section sent without ``fields``
+    keeps its stored fields; otherwise fields it no longer lists are deleted.
+    Stored sections that are not sent are deleted with their fields. Fields
+    outside any section are left alone unless a section claims them by id.
+
+    Args:
+        tree (FormTree): The stored tree, from ``load_form_tree``.
+        sections_data (list): The submitted sections (``UpdateForm.sections``).
+
+    Returns:
+        FormTreeDiff: The changes to apply.
+    """
+    form = tree.form
+    diff = FormTreeDiff()
+    stored_sections = {section.id: section for section, _ in tree.sections}
+    fields_by_section = {section.id: fields for section, fields in tree.sections}
+    stored_fields = {field.id: field for _, fields in tree.sections for field in fields}
+    stored_fields.update((field.id, field) for field in tree.orphan_fields)
+    kept_fields = {field.id for field in tree.orphan_fields}
+    claimed_fields = set()
+
+    for section_data in sections_data:
+        section = stored_sections.pop(section_data.id, None) if section_data.id else None
+        if section is not None:
+            values = section_data.model_dump(exclude_unset=True, include=set(SECTION_COLUMNS))
+            if _assign(section, values):
+                diff.changed_sections.append(section)
+        else:
+            # Written by the first bulk insert of ``apply``; until then its
+            # fields can only refer to it by id (see ``build_field``)
+            section = FormSections(
+                form_ref_id=form.id,
+                title=section_data.title,
+                description=section_data.description,
+                order=section_data.order or 1
+            )
+            diff.new_sections.append(section)
+
+        if section_data.fields is None:
+            kept_fields.update(field.id for field in fields_by_section.get(section.id, ()))
+            continue
+
+        for field_data in section_data.fields:
+            field = stored_fields.get(field_data.id) if field_data.id else None
+            if field is None or field.id in claimed_fields:
+                diff.new_fields.append(build_field(form, section, field_data))
+                continue
+            claimed_fields.add(field.id)
+            values = {column: getattr(field_data, column) for column in FIELD_COLUMNS if column != "section_ref_id"}
+            values["section_ref_id"] = section.id
+            if _assign(field, values):
+                diff.changed_fields.append(field)
+
+    kept_fields |= claimed_fields
+    diff.deleted_section_ids = list(stored_sections)
+    diff.deleted_field_ids = [field_id for field_id in stored_fields if field_id not in kept_fields]
+    return diff
@@ -0,0 +1,70 @@
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from tortoise.fields.relational import ReverseRelation
+from models import Forms, FormSections, FormFields
+
+
+class FormTree:
+    """
+    The section/field hierarchy of a form, loaded in one go.
+
+    Attributes:
+        form (Forms): The form the tree belongs to.
+        sections (list): ``(section, fields)`` pairs ordered by ``order``, each
+            field list ordered by ``field_order``.
+        orphan_fields (list): Fields that do not belong to any section.
+    """
+
+    __slots__ = ("form", "sections", "orphan_fields")
+
+    def __init__(self, form: Forms, sections: List[Tuple[FormSections, List[FormFields]]], orphan_fields: List[FormFields]):
+        self.form = form
+        self.sections = sections
+        self.orphan_fields = orphan_fields
+
+    @property
+    def total_fields(self) -> int:
+        return sum(len(fields) for _, fields in self.sections) + len(self.orphan_fields)
+
+
+def _prefetched(form: Forms, name: str) -> Optional[list]:
+    relation = form.__dict__.get(f"_{name}")
+    if isinstance(relation, ReverseRelation) and relation._fetched:
+        return list(relation.related_objects)
+    return None
+
+
+async def load_form_tree(form: Forms) -> FormTree:
+    """
+    Builds the section and field hierarchy of a form.
+
+    Uses the ``sections`` and ``fields`` relations when the caller already
+    prefetched them, otherwise runs exactly two queries (one per table) and
+    groups the fields by ``section_ref_id`` in memory.
+
+    Args:
+        form (Forms): The form whose tree should be loaded.
+
+    Returns:
+        FormTree: The ordered sections with their fields plus orphan fields.
+    """
+    sections = _prefetched(form, "sections")
+    if sections is None:
+        sections = await FormSections.filter(form_ref_id=form.id).order_by("order")
+
+    fields = _prefetched(form, "fields")
+    if fields is None:
+        fields = await FormFields.filter(form_ref_id=form.id).order_by("field_order")
+
+    fields_by_section: Dict[Optional[str], List[FormFields]] = defaultdict(list)
+    for field in sorted(fields, key=lambda field: field.field_order):
+        fields_by_section[field.section_ref_id].append(field)
+
+    return FormTree(
+        form=form,
+        sections=[
+            (section, fields_by_section.pop(section.id, []))
+            for section in sorted(sections, key=lambda section: section.order)
+        ],
+        orphan_fields=fields_by_section.pop(None, []),
+    )
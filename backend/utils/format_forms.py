@@ -1,7 +1,9 @@
 from models import  Forms, FormSections, FormFields
 from typing import Any, Dict, List, Optional
 from pydantic import BaseModel
+from .form_tree import load_form_tree
 class FormFieldResponse(BaseModel):
+    id: str
     field_name: str
     field_type: str
     required: bool
@@ -10,6 +12,7 @@ class FormFieldResponse(BaseModel):
     field_order: int
 
 class FormSectionResponse(BaseModel):
+    id: Optional[str] = None  # None for the synthetic "General" section
     title: str
     description: Optional[str] = None
     order: int
@@ -45,11 +48,24 @@ class FormTemplateResponse(BaseModel):
     cover_image: Optional[str] = None
 
 
+def _format_field(field: FormFields) -> FormFieldResponse:
+    return FormFieldResponse(
+        id=str(field.id),
+        field_name=field.field_name,
+        field_type=field.field_type,
+        required=field.required,
+        constraints=field.constraints,
+        section=field.section,
+        field_order=field.field_order
+    )
+
+
 async def format_form(form :Forms):
     """
     Formats a Forms object into a structured FormResponse.
 
-    This function retrieves sections and fields associated with a given form, 
+    This function loads the sections and fields associated with a given form 
+    through ``load_form_tree`` (reusing prefetched relations when present), 
     organizes them into a hierarchical structure, and returns a formatted 
     FormResponse object. It includes fields that do not belong to any section 
     under a "General" section.
@@ -64,40 +80,22 @@ async def format_form(form :Forms):
     if not form.public_id:
         print(True)
         form.public_id = form.generate_public_id()
-        await form.save()
+        await form.save(update_fields=["public_id"])
+
+    tree = await load_form_tree(form)
 
     sections = []
-    for section in await form.sections.all().order_by("order"):
-        section_fields = []
-        for field in await section.fields.all().order_by("field_order"):
-
-            section_fields.append(FormFieldResponse(
-                field_name=field.field_name,
-                field_type=field.field_type,
-                required=field.required,
-                constraints=field.constraints,
-                section=field.section,
-                field_order=field.field_order
-            ))
-        
+    for section, fields in tree.sections:
         sections.append(FormSectionResponse(
+            id=str(section.id),
             title=section.title,
             description=section.description,
             order=section.order,
-            fields=section_fields
+            fields=[_format_field(field) for field in fields]
         ))
 
     # Include fields not in any section (if any)
-    orphan_fields = []
-    for field in await form.fields.filter(section_ref=None).order_by("field_order"):
-        orphan_fields.append(FormFieldResponse(
-            field_name=field.field_name,
-            field_type=field.field_type,
-            required=field.required,
-            constraints=field.constraints,
-            section=field.section,
-            field_order=field.field_order
-        ))
+    orphan_fields = [_format_field(field) for field in tree.orphan_fields]
     
     if orphan_fields:
         sections.append(FormSectionResponse(
@@ -143,18 +141,14 @@ async def format_form_template(form: Forms) -> Dict[str, Any]:
     Returns:
         dict: A dictionary with title, detail, total_fields, and owner information.
     """
-    field_count = 0
     owner = await form.owner
-    for section in await form.sections.all():
-        field_count += await section.fields.all().count()
-    
-    field_count += await form.fields.filter(section_ref=None).count()
+    tree = await load_form_tree(form)
     
     response = FormTemplateResponse(
         id=str(form.id),
         title=form.title,
         detail=form.detail or "",
-        total_fields=field_count,
+        total_fields=tree.total_fields,
         cover_image=form.cover_image or None,
         owner = owner.company or f"{owner.first_name} {owner.last_name}"
     )
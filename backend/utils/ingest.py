@@ -0,0 +1,154 @@
+import asyncio
+import os
+from collections import Counter
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+from nexios.logging import getLogger
+from tortoise import timezone
+from tortoise.transactions import in_transaction
+from models.form_response import FormResponse
+from models.forms import Forms
+from .cache import LRUCache
+from .rollups import record_responses
+
+logger = getLogger(__name__)
+
+SUBMISSION_INGEST_MODE = os.getenv("SUBMISSION_INGEST_MODE", "sync")  # "sync" or "batch"
+SUBMISSION_BATCH_SIZE = int(os.getenv("SUBMISSION_BATCH_SIZE", 500))
+SUBMISSION_FLUSH_INTERVAL = float(os.getenv("SUBMISSION_FLUSH_INTERVAL", 0.05))
+SUBMISSION_QUEUE_SIZE = int(os.getenv("SUBMISSION_QUEUE_SIZE", 10000))
+SUBMISSION_ENQUEUE_TIMEOUT = float(os.getenv("SUBMISSION_ENQUEUE_TIMEOUT", 1.0))
+
+PENDING = "pending"
+DELIVERED = "delivered"
+FAILED = "failed"
+
+
+class IngestBusy(Exception):
+    """Raised when the submission queue stays full past the enqueue timeout."""
+
+
+def _status_key(response: FormResponse) -> str:
+    # Statuses are looked up through the public form link they were submitted to
+    return f"{response.form_ref.public_id}/{response.id}"
+
+
+class SubmissionBuffer:
+    """
+    Buffers validated submissions and writes them with multi-row inserts.
+
+    Submissions are put on a bounded ``asyncio.Queue``. A single writer task
+    drains it and flushes with ``bulk_create`` once ``batch_size`` rows are
+    waiting or ``flush_interval`` seconds have passed since the first row of
+    the batch, whichever comes first. The analytics rollups of a batch are
+    updated in the same transaction as its insert. A full queue applies backpressure:
+    ``enqueue`` waits up to ``enqueue_timeout`` and then raises ``IngestBusy``.
+
+    The delivery status of every submission (pending, delivered or failed) is
+    kept in a bounded cache and can be read with ``delivery_status``.
+
+    The form's ``response_count`` is bumped when a submission is queued, before
+    its row is written: until the batch is flushed the count runs ahead of the
+    rows in ``formresponse``, and a failed flush gives the slots back.
+    """
+
+    def __init__(self, batch_size: int = SUBMISSION_BATCH_SIZE, flush_interval: float = SUBMISSION_FLUSH_INTERVAL,
+                 max_queue: int = SUBMISSION_QUEUE_SIZE, enqueue_timeout: float = SUBMISSION_ENQUEUE_TIMEOUT):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.enqueue_timeout = enqueue_timeout
+        self.results = LRUCache("submission_deliveries", max_entries=max(max_queue * 4, 1024))
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._closing = False
+
+    def _ensure_writer(self) -> asyncio.Queue:
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.create_task(self._run())
+        return self._queue
+
+    async def enqueue(self, response: FormResponse) -> UUID:
+        """
+        Queues an unsaved ``FormResponse`` for the next batch and returns its id.
+        The caller is expected to have reserved its ``response_count`` slot.
+
+        Once the buffer is shutting down, the row is written directly instead.
+        """
+        if response.created_at is None:
+            response.created_at = timezone.now()
+        if self._closing:
+            async with in_transaction() as conn:
+                await response.save(using_db=conn)
+                await record_responses([response], using_db=conn)
+            self.results.set(_status_key(response), {"status": DELIVERED})
+            return response.id
+
+        queue = self._ensure_writer()
+        try:
+            await asyncio.wait_for(queue.put(response), self.enqueue_timeout)
+        except asyncio.TimeoutError:
+            raise IngestBusy("Submission queue is full")
+        self.results.set(_status_key(response), {"status": PENDING})
+        return response.id
+
+    def delivery_status(self, form_public_id: str, submission_id: str) -> Optional[Dict[str, Any]]:
+        """Returns the status of a submission, or ``None`` if it is unknown or belongs to another form."""
+        return self.results.get(f"{form_public_id}/{submission_id}")
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        stopping = False
+        while not stopping:
+            item = await queue.get()
+            if item is None:
+                break
+            batch: List[FormResponse] = [item]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[FormResponse]) -> None:
+        try:
+            async with in_transaction() as conn:
+                await FormResponse.bulk_create(batch, using_db=conn)
+                await record_responses(batch, using_db=conn)
+        except Exception as exc:
+            logger.error(f"Failed to write {len(batch)} buffered submissions: {exc}")
+            for response in batch:
+                self.results.set(_status_key(response), {"status": FAILED, "error": str(exc)})
+            # Hand back the response_count slots reserved when these were queued
+            for form_id, count in Counter(response.form_ref_id for response in batch).items():
+                await Forms.release_responses(form_id, count)
+            return
+        for response in batch:
+            self.results.set(_status_key(response), {"status": DELIVERED})
+
+    async def stop(self) -> None:
+        """Flushes everything still queued and stops the writer task."""
+        self._closing = True
+        if self._writer is None or self._writer.done():
+            return
+        await self._queue.put(None)
+        await self._writer
+
+
+submission_buffer = SubmissionBuffer()
+
+
+def batch_ingest_enabled() -> bool:
+    return SUBMISSION_INGEST_MODE == "batch"
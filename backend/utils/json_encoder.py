@@ -0,0 +1,101 @@
+"""
+JSON encoding of API responses.
+
+Nexios renders every dict/list a handler returns, and every ``res.json(...)``,
+through ``json.dumps(..., default=str)``. ``install_json_encoder`` swaps that
+for ``dumps`` below, which uses orjson when it is installed and the standard
+library otherwise. Both paths write UUIDs as strings, datetimes/dates/times in
+ISO 8601 and Decimals as strings, so the output does not depend on which one
+is active. The backend is chosen with ``JSON_ENCODER`` (``orjson`` or
+``stdlib``) or at runtime with ``set_encoder``.
+"""
+import json
+import os
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Callable, Dict, Optional
+from uuid import UUID
+from nexios.http.response import BaseResponse, JSONResponse, NexiosResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+Encoder = Callable[[Any], bytes]
+
+
+def _default(value: Any) -> Any:
+    """Encodes the types the JSON module does not know about."""
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    # Same catch-all as Nexios' own encoder
+    return str(value)
+
+
+def stdlib_dumps(content: Any) -> bytes:
+    return json.dumps(content, default=_default, allow_nan=False, separators=(",", ":")).encode()
+
+
+def orjson_dumps(content: Any) -> bytes:
+    # orjson encodes UUID, datetime, date, time and enums natively; _default
+    # only sees Decimals, pydantic models and anything else unusual.
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+ENCODERS: Dict[str, Encoder] = {"stdlib": stdlib_dumps}
+if orjson is not None:
+    ENCODERS["orjson"] = orjson_dumps
+
+_encoder: Encoder = ENCODERS.get(os.getenv("JSON_ENCODER", "orjson"), stdlib_dumps)
+
+
+def set_encoder(encoder: Encoder) -> None:
+    """Replaces the function used to encode response bodies."""
+    global _encoder
+    _encoder = encoder
+
+
+def dumps(content: Any) -> bytes:
+    """Encodes ``content`` to UTF-8 JSON with the active encoder."""
+    return _encoder(content)
+
+
+class FastJSONResponse(JSONResponse):
+    """``JSONResponse`` whose body is produced by ``dumps``."""
+
+    def __init__(self, content: Any, status_code: int = 200, headers: Optional[Dict[str, str]] = None):
+        try:
+            body = dumps(content)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Content is not JSON serializable: {str(e)}")
+        BaseResponse.__init__(
+            self,
+            body=body,
+            status_code=status_code,
+            headers=headers,
+            content_type="application/json",
+        )
+
+
+_nexios_json = NexiosResponse.json
+
+
+def _json(self: NexiosResponse, data: Any, status_code: int = 200, headers: Dict[str, Any] = {},
+          indent: Optional[int] = None, ensure_ascii: bool = True):
+    if indent is not None:
+        # Pretty-printed output is only asked for by tooling; keep Nexios' encoder
+        return _nexios_json(self, data, status_code=status_code, headers=headers, indent=indent,
+                            ensure_ascii=ensure_ascii)
+    response = FastJSONResponse(content=data, status_code=status_code, headers=headers)
+    self._response = self._preserve_headers_and_cookies(response)
+    return self
+
+
+def install_json_encoder() -> None:
+    """Routes ``NexiosResponse.json`` (and so every returned dict/list) through ``dumps``."""
+    NexiosResponse.json = _json
@@ -0,0 +1,162 @@
+import base64
+import json
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+from tortoise.expressions import Q
+from tortoise.queryset import QuerySet
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 200
+
+NEXT = "next"
+PREV = "prev"
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(created_at: datetime, id: Any, direction: str) -> str:
+    payload = json.dumps([created_at.isoformat(), str(id), direction], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id, direction = json.loads(base64.urlsafe_b64decode(padded))
+        if direction not in (NEXT, PREV):
+            raise ValueError(direction)
+        return datetime.fromisoformat(created_at), UUID(id), direction
+    except (ValueError, TypeError, json.JSONDecodeError) as exc:
+        raise InvalidCursor("Invalid pagination cursor") from exc
+
+
+def page_size(value: Optional[str], default: int = DEFAULT_PAGE_SIZE) -> int:
+    try:
+        return max(1, min(int(value), MAX_PAGE_SIZE)) if value else default
+    except ValueError:
+        return default
+
+
+def is_paged(query_params) -> bool:
+    """
+    Whether a listing request asked for pagination. Clients that send neither
+    ``cursor`` nor ``limit`` predate it and still get the whole listing.
+    """
+    return "cursor" in query_params or "limit" in query_params
+
+
+class Page:
+    """One page of a keyset-paginated listing, newest first."""
+
+    __slots__ = ("items", "next_cursor", "prev_cursor")
+
+    def __init__(self, items: List[Any], next_cursor: Optional[str], prev_cursor: Optional[str]):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+    def headers(self, total: Optional[int] = None) -> Dict[str, str]:
+        """Cursor headers, so listings keep returning a plain JSON array."""
+        headers = {}
+        if self.next_cursor:
+            headers["X-Next-Cursor"] = self.next_cursor
+        if self.prev_cursor:
+            headers["X-Prev-Cursor"] = self.prev_cursor
+        if total is not None:
+            headers["X-Total-Count"] = str(total)
+        return headers
+
+
+def _key(row: Any) -> Tuple[datetime, Any]:
+    if isinstance(row, dict):
+        return row["created_at"], row["id"]
+    return row.created_at, row.id
+
+
+async def paginate(queryset: QuerySet, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE,
+                   fields: Optional[Tuple[str, ...]] = None) -> Page:
+    """
+    Returns one page of ``queryset`` ordered by ``(created_at, id)`` descending.
+
+    The page is located with a keyset condition on ``(created_at, id)`` instead
+    of ``OFFSET``, so deep pages cost the same as the first one. Cursors are
+    opaque strings that remember the boundary row and the direction of travel.
+
+    Args:
+        queryset: The filtered queryset to page through.
+        cursor (str, optional): A ``next``/``prev`` cursor from a previous page.
+        limit (int): Page size.
+        fields (tuple, optional): Columns to fetch with ``.values()``; model instances when omitted.
+
+    Raises:
+        InvalidCursor: If ``cursor`` was not produced by this module.
+    """
+    if fields:
+        fields = tuple(dict.fromkeys(("id", "created_at", *fields)))
+    direction = NEXT
+    if cursor:
+        created_at, id, direction = decode_cursor(cursor)
+        if direction == NEXT:
+            queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=id))
+        else:
+            queryset = queryset.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=id))
+
+    ordering = ("-created_at", "-id") if direction == NEXT else ("created_at", "id")
+    queryset = queryset.order_by(*ordering).limit(limit + 1)
+    rows = list(await (queryset.values(*fields) if fields else queryset))
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if direction == PREV:
+        rows.reverse()
+    if not rows:
+        return Page([], None, None)
+
+    first, last = _key(rows[0]), _key(rows[-1])
+    more_after = has_more if direction == NEXT else bool(cursor)
+    more_before = bool(cursor) if direction == NEXT else has_more
+    return Page(
+        rows,
+        encode_cursor(*last, NEXT) if more_after else None,
+        encode_cursor(*first, PREV) if more_before else None,
+    )
+
+
+def paginate_sorted(keys: Sequence[Tuple[datetime, Any]], rows: Sequence[Any], cursor: Optional[str] = None,
+                    limit: int = DEFAULT_PAGE_SIZE) -> Page:
+    """
+    ``paginate`` for an in-memory listing, with the same cursors.
+
+    Args:
+        keys (list): ``(created_at, id)`` of every row, in ascending order.
+        rows (list): The rows, in the same order as ``keys``.
+        cursor (str, optional): A ``next``/``prev`` cursor from a previous page.
+        limit (int): Page size.
+
+    Raises:
+        InvalidCursor: If ``cursor`` was not produced by this module.
+    """
+    direction = NEXT
+    end = len(rows)
+    if cursor:
+        created_at, id, direction = decode_cursor(cursor)
+        if direction == NEXT:
+            end = bisect_left(keys, (created_at, id))
+        else:
+            start = bisect_right(keys, (created_at, id))
+            end = min(start + limit, len(rows))
+    start = max(end - limit, 0) if direction == NEXT else start
+    items = list(reversed(rows[start:end]))
+    if not items:
+        return Page([], None, None)
+
+    more_after = start > 0
+    more_before = end < len(rows)
+    return Page(
+        items,
+        encode_cursor(*keys[start], NEXT) if more_after else None,
+        encode_cursor(*keys[end - 1], PREV) if more_before else None,
+    )
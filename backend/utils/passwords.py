@@ -0,0 +1,92 @@
+"""
+Password hashing off the event loop.
+
+A bcrypt hash or check takes 100-300 ms of CPU. Run inline in a handler it
+blocks every other request of the worker, so both run in a dedicated,
+fixed-size thread pool (bcrypt releases the GIL while hashing). A login burst
+then queues behind the pool instead of freezing the loop; ``password_pool``
+records how long calls waited for a thread so the pool can be sized.
+"""
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, TypeVar
+import bcrypt
+
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1)))
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+
+T = TypeVar("T")
+
+
+class PasswordPool:
+    """
+    Runs password work in a bounded thread pool and tracks queue time.
+
+    Args:
+        workers (int): Number of threads, i.e. hashes computed at once.
+    """
+
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS):
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.waiting = 0
+        self.queue_seconds = 0.0
+        self.max_queue_seconds = 0.0
+        self.run_seconds = 0.0
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        submitted = time.perf_counter()
+        with self._lock:
+            self.waiting += 1
+
+        def timed() -> T:
+            started = time.perf_counter()
+            waited = started - submitted
+            with self._lock:
+                self.waiting -= 1
+                self.queue_seconds += waited
+                self.max_queue_seconds = max(self.max_queue_seconds, waited)
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self.calls += 1
+                    self.run_seconds += time.perf_counter() - started
+
+        return await asyncio.get_running_loop().run_in_executor(self._executor, timed)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "workers": self.workers,
+            "calls": self.calls,
+            "waiting": self.waiting,
+            "avg_queue_ms": 1000 * self.queue_seconds / self.calls if self.calls else 0.0,
+            "max_queue_ms": 1000 * self.max_queue_seconds,
+            "avg_run_ms": 1000 * self.run_seconds / self.calls if self.calls else 0.0,
+        }
+
+
+password_pool = PasswordPool()
+
+
+def _hash(password: str, rounds: int) -> str:
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=rounds)).decode('utf-8')
+
+
+def _check(password: str, hashed_password: str) -> bool:
+    return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+
+async def hash_password(password: str, rounds: int = BCRYPT_ROUNDS) -> str:
+    """Hashes ``password`` with bcrypt at cost ``rounds`` (``BCRYPT_ROUNDS``) in ``password_pool``."""
+    return await password_pool.run(_hash, password, rounds)
+
+
+async def verify_password(password: str, hashed_password: str) -> bool:
+    """Checks ``password`` against a bcrypt hash of any cost in ``password_pool``."""
+    return await password_pool.run(_check, password, hashed_password)
@@ -0,0 +1,158 @@
+"""
+Read-through cache of the public form served to respondents.
+
+``GET /v1/public/{public_id}/details`` is the hottest endpoint of the API and
+the form it returns rarely changes, so the serialized body is kept in memory
+keyed by ``public_id``. Entries are dropped whenever a form is saved or
+deleted (Tortoise ``post_save``/``post_delete`` signals) and by the form
+routes once their transaction has committed, so a concurrent reader cannot
+re-cache the previous version. Those evictions only reach the process that
+made the change; other workers see it once their entry's
+``PUBLIC_FORM_CACHE_TTL`` runs out.
+"""
+import hashlib
+import os
+from datetime import UTC, datetime
+from typing import Any, Dict, Optional
+from tortoise.expressions import Q
+from tortoise.signals import post_delete, post_save
+from models import Forms
+from .cache import LRUCache
+from .format_forms import format_form
+from .json_encoder import dumps
+from .single_flight import SingleFlight
+
+PUBLIC_FORM_CACHE_SIZE = int(os.getenv("PUBLIC_FORM_CACHE_SIZE", 1024))
+PUBLIC_FORM_CACHE_MAX_BYTES = int(os.getenv("PUBLIC_FORM_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+PUBLIC_FORM_CACHE_TTL = float(os.getenv("PUBLIC_FORM_CACHE_TTL", 10))
+# Browsers always revalidate (cheap thanks to the ETag); shared caches such as
+# a CDN may serve the form for PUBLIC_FORM_SHARED_MAX_AGE seconds after an edit.
+PUBLIC_FORM_MAX_AGE = int(os.getenv("PUBLIC_FORM_MAX_AGE", 0))
+PUBLIC_FORM_SHARED_MAX_AGE = int(os.getenv("PUBLIC_FORM_SHARED_MAX_AGE", 60))
+
+public_form_cache = LRUCache(
+    "public_forms",
+    max_entries=PUBLIC_FORM_CACHE_SIZE,
+    max_weight=PUBLIC_FORM_CACHE_MAX_BYTES,
+    ttl=PUBLIC_FORM_CACHE_TTL,
+)
+_loads = SingleFlight()
+_row_reads = SingleFlight()
+# Bumped by every invalidation, so a load that raced an edit is not cached
+_generation = 0
+
+
+class PublicForm:
+    """A published form together with its serialized public representation."""
+
+    __slots__ = ("form", "data", "body", "etag")
+
+    def __init__(self, form: Forms, data: Dict[str, Any], body: bytes):
+        self.form = form
+        self.data = data
+        self.body = body
+        self.etag = make_etag(form)
+
+    @property
+    def expired(self) -> bool:
+        return bool(self.form.active_until and self.form.active_until < datetime.now(UTC))
+
+    def not_modified(self, if_none_match: Optional[str]) -> bool:
+        """Whether an ``If-None-Match`` header matches this version of the form."""
+        if not if_none_match:
+            return False
+        tags = {tag.strip() for tag in if_none_match.split(",")}
+        return "*" in tags or self.etag in tags
+
+    def cache_headers(self) -> Dict[str, str]:
+        shared_max_age = PUBLIC_FORM_SHARED_MAX_AGE
+        if self.form.active_until:
+            # Never let a shared cache keep serving a form past its closing time
+            remaining = int((self.form.active_until - datetime.now(UTC)).total_seconds())
+            shared_max_age = max(0, min(shared_max_age, remaining))
+        return {
+            "ETag": self.etag,
+            "Cache-Control": f"public, max-age={PUBLIC_FORM_MAX_AGE}, s-maxage={shared_max_age}, must-revalidate",
+        }
+
+
+def make_etag(form: Forms) -> str:
+    """Strong ETag of a form version, derived from its id and ``updated_at``."""
+    version = f"{form.id}:{form.updated_at.isoformat()}"
+    return '"' + hashlib.sha1(version.encode()).hexdigest() + '"'
+
+
+def _active_forms():
+    return Forms.filter(Q(draft=False) & Q(is_active=True))
+
+
+async def get_public_form(public_id: str) -> Optional[PublicForm]:
+    """
+    Returns the published form with the given ``public_id``, serialized.
+
+    The result is served from ``public_form_cache`` when present. On a miss
+    the form is loaded and formatted once, however many requests are waiting
+    for it: concurrent misses for the same ``public_id`` share one load
+    through ``SingleFlight``. Drafts and inactive forms are never cached.
+    Expiry (``active_until``) is checked by the caller on every hit, since it
+    does not involve a write.
+
+    Args:
+        public_id (str): The public identifier from the form link.
+
+    Returns:
+        PublicForm: The cached form, or ``None`` if no active form has that id.
+    """
+    entry = public_form_cache.get(public_id)
+    if entry is not None:
+        return entry
+    return await _loads.do(public_id, lambda: _load_public_form(public_id))
+
+
+async def _load_public_form(public_id: str) -> Optional[PublicForm]:
+    generation = _generation
+    form = await _active_forms().filter(public_id=public_id).first()
+    if not form:
+        return None
+    data = await format_form(form)
+    entry = PublicForm(form, data, dumps(data))
+    if _generation == generation:
+        public_form_cache.set(public_id, entry, weight=len(entry.body))
+    return entry
+
+
+async def load_active_form(public_id: str) -> Optional[Forms]:
+    """
+    Reads the current row of an active form, bypassing ``public_form_cache``.
+
+    Used where a stale copy from this process' cache is not acceptable
+    (submissions). Concurrent reads for the same ``public_id`` still share
+    one query.
+    """
+    return await _row_reads.do(public_id, lambda: _active_forms().filter(public_id=public_id).first())
+
+
+def cached_form_data(form: Forms) -> Optional[Dict[str, Any]]:
+    """The cached ``format_form`` output of ``form``, if it is of the same version as ``form``."""
+    entry = public_form_cache.get(form.public_id)
+    if entry is not None and entry.etag == make_etag(form):
+        return entry.data
+    return None
+
+
+def invalidate_public_form(public_id: Optional[str]) -> None:
+    global _generation
+    if public_id:
+        _generation += 1
+        public_form_cache.pop(public_id)
+        _loads.forget(public_id)
+
+
+@post_save(Forms)
+async def _form_saved(sender, instance: Forms, created, using_db, update_fields) -> None:
+    invalidate_public_form(instance.public_id)
+
+
+@post_delete(Forms)
+async def _form_deleted(sender, instance: Forms, using_db) -> None:
+    invalidate_public_form(instance.public_id)
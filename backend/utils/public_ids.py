@@ -0,0 +1,75 @@
+"""
+Generation of the public identifiers used in form links.
+
+Identifiers are drawn from ``secrets`` (the OS CSPRNG) with rejection
+sampling, so every character of the alphabet is equally likely. With the
+default 10 base62 characters there are ~8.4e17 possible ids; the unique
+constraint on ``forms.public_id`` catches the rare collision and ``Forms.save``
+retries with a fresh id. To measure generation throughput, run from the
+backend directory:
+
+    python -m utils.public_ids [count]
+"""
+import os
+import secrets
+import sys
+import time
+
+BASE62 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+
+PUBLIC_ID_LENGTH = int(os.getenv("PUBLIC_ID_LENGTH", 10))
+PUBLIC_ID_ALPHABET = os.getenv("PUBLIC_ID_ALPHABET", BASE62)
+PUBLIC_ID_MAX_ATTEMPTS = int(os.getenv("PUBLIC_ID_MAX_ATTEMPTS", 5))
+
+# Name Postgres gives the UNIQUE constraint of forms.public_id (migration 8)
+PUBLIC_ID_CONSTRAINT = "forms_public_id_key"
+
+
+def generate_public_id(length: int = PUBLIC_ID_LENGTH, alphabet: str = PUBLIC_ID_ALPHABET) -> str:
+    """
+    Returns a random identifier of ``length`` characters taken from ``alphabet``.
+
+    Random bytes are mapped onto the alphabet with ``byte % len(alphabet)``;
+    bytes at or above the largest multiple of the alphabet size are discarded
+    so the result stays uniform.
+
+    Args:
+        length (int): Number of characters.
+        alphabet (str): Between 2 and 256 distinct characters.
+    """
+    size = len(alphabet)
+    if not 2 <= size <= 256:
+        raise ValueError("alphabet must have between 2 and 256 characters")
+    limit = 256 - 256 % size
+    chars = []
+    while len(chars) < length:
+        # Ask for a few spare bytes so one read is almost always enough
+        for byte in secrets.token_bytes(length + length // 2 + 4):
+            if byte < limit:
+                chars.append(alphabet[byte % size])
+                if len(chars) == length:
+                    break
+    return "".join(chars)
+
+
+def is_public_id_conflict(exc: Exception) -> bool:
+    """
+    Whether an ``IntegrityError`` comes from the unique constraint on
+    ``forms.public_id``: Postgres names the constraint, SQLite the column.
+    """
+    message = str(exc)
+    return PUBLIC_ID_CONSTRAINT in message or "forms.public_id" in message
+
+
+def benchmark(count: int = 1_000_000) -> float:
+    """Generates ``count`` ids with the configured settings and returns ids per second."""
+    start = time.perf_counter()
+    for _ in range(count):
+        generate_public_id()
+    return count / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rate = benchmark(count)
+    print(f"{count} ids of {PUBLIC_ID_LENGTH} chars from a {len(PUBLIC_ID_ALPHABET)}-char alphabet: {rate:,.0f} ids/s")
@@ -57,6 +57,9 @@ def create_model_from_form(form: Dict[str, Any]) -> BaseModel:
                     kwargs["ge"] = constraints["min"]
                 if "max" in constraints:
                     kwargs["le"] = constraints["max"]
+            if pyd_type == float:
+                # float() accepts "nan" and "inf", which are not answers
+                kwargs["allow_inf_nan"] = False
 
             # Scale specific constraints
             if type_name == "scale":
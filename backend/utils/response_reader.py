@@ -0,0 +1,69 @@
+from typing import Any, AsyncIterator, Dict, List, Sequence, Tuple
+from tortoise.expressions import Q
+from models import Forms
+from models.form_response import FormResponse, SERIALIZED_FIELDS
+from models.form_fields import FieldTypeEnum
+from .form_tree import load_form_tree
+
+RESPONSE_COLUMNS = SERIALIZED_FIELDS
+
+EMAIL_COLUMN = "Email"
+
+
+async def iter_response_chunks(
+    form_id,
+    chunk_size: int = 1000,
+    columns: Sequence[str] = RESPONSE_COLUMNS,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Yields the responses of a form as lists of row dicts, oldest first.
+
+    Rows are read with keyset pagination on ``(created_at, id)`` so every
+    chunk costs the same no matter how deep into the table it is, and only
+    one chunk is held in memory at a time.
+
+    Args:
+        form_id: Id of the form whose responses are read.
+        chunk_size (int): Maximum number of rows per chunk.
+        columns (list): Columns to select. ``id`` and ``created_at`` are always included.
+
+    Yields:
+        list: Up to ``chunk_size`` rows as dictionaries.
+    """
+    columns = list(dict.fromkeys(("id", "created_at", *columns)))
+    last = None
+    while True:
+        query = FormResponse.filter(form_ref_id=form_id)
+        if last is not None:
+            query = query.filter(Q(created_at__gt=last[0]) | Q(created_at=last[0], id__gt=last[1]))
+        rows = await query.order_by("created_at", "id").limit(chunk_size).values(*columns)
+        if not rows:
+            return
+        yield rows
+        if len(rows) < chunk_size:
+            return
+        last = (rows[-1]["created_at"], rows[-1]["id"])
+
+
+async def export_columns(form: Forms) -> List[Tuple[str, FieldTypeEnum]]:
+    """
+    Returns the answer columns of an export as ``(name, field_type)`` pairs: the
+    form's fields in display order, preceded by the email column when the
+    form collects emails.
+    """
+    tree = await load_form_tree(form)
+    columns: Dict[str, FieldTypeEnum] = {}
+    for field in [field for _, fields in tree.sections for field in fields] + tree.orphan_fields:
+        columns.setdefault(field.field_name, FieldTypeEnum(field.field_type))
+    if form.collect_email:
+        return [(EMAIL_COLUMN, FieldTypeEnum.EMAIL), *columns.items()]
+    return list(columns.items())
+
+
+def answer_row(response: Dict[str, Any] | None, fieldnames: Sequence[str]) -> Dict[str, Any]:
+    """Maps a stored ``response`` JSON object onto the export columns."""
+    response = response or {}
+    row = {name: response.get(name) for name in fieldnames}
+    if EMAIL_COLUMN in row and row[EMAIL_COLUMN] is None:
+        row[EMAIL_COLUMN] = response.get("email")
+    return row
@@ -0,0 +1,112 @@
+"""
+Maintains the ``response_rollups`` table (see models/response_rollup.py).
+
+``record_responses`` is called whenever responses are written, in the same
+transaction as the insert. To rebuild the rollups from ``FormResponse``, run
+from the backend directory:
+
+    python -m utils.rollups [form_id ...]
+"""
+import asyncio
+import sys
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Iterable, Optional, Sequence
+from tortoise import Tortoise, connections
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.transactions import in_transaction
+from models.form_response import FormResponse
+
+GRANULARITIES = ("hour", "day")
+
+DIMENSIONS = {
+    "device": "device_family",
+    "os": "device_os",
+    "browser": "device_browser",
+    "brand": "device_brand",
+}
+
+UPSERT_SQL = """
+INSERT INTO "response_rollups" ("id", "form_ref_id", "granularity", "bucket", "dimension", "value", "total")
+SELECT md5(random()::text || clock_timestamp()::text)::uuid, *
+FROM unnest($1::uuid[], $2::text[], $3::timestamptz[], $4::text[], $5::text[], $6::int[])
+ON CONFLICT ("form_ref_id", "granularity", "bucket", "dimension", "value")
+DO UPDATE SET "total" = "response_rollups"."total" + EXCLUDED."total", "updated_at" = CURRENT_TIMESTAMP
+"""
+
+REBUILD_SQL = """
+INSERT INTO "response_rollups" ("id", "form_ref_id", "granularity", "bucket", "dimension", "value", "total")
+SELECT md5(random()::text || clock_timestamp()::text)::uuid, r."form_ref_id", g."granularity",
+       date_trunc(g."granularity", r."created_at" AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+       d."dimension", d."value", COUNT(*)
+FROM "formresponse" r
+CROSS JOIN (VALUES ('hour'), ('day')) AS g("granularity")
+CROSS JOIN LATERAL (VALUES
+    ('device', COALESCE(r."device_family", '')),
+    ('os', COALESCE(r."device_os", '')),
+    ('browser', COALESCE(r."device_browser", '')),
+    ('brand', COALESCE(r."device_brand", ''))
+) AS d("dimension", "value")
+{where}
+GROUP BY 2, 3, 4, 5, 6
+"""
+
+
+def truncate(moment: datetime, granularity: str) -> datetime:
+    moment = moment.astimezone(timezone.utc) if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+    moment = moment.replace(minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        moment = moment.replace(hour=0)
+    return moment
+
+
+async def record_responses(responses: Iterable[FormResponse], using_db: Optional[BaseDBAsyncClient] = None) -> None:
+    """
+    Adds freshly written responses to the rollups with a single upsert.
+
+    Args:
+        responses (list): Saved ``FormResponse`` objects (``created_at`` must be set).
+        using_db: Connection or transaction to run in, so the rollup update
+            commits or rolls back together with the insert.
+    """
+    counts = Counter()
+    for response in responses:
+        for granularity in GRANULARITIES:
+            bucket = truncate(response.created_at, granularity)
+            for dimension, column in DIMENSIONS.items():
+                counts[(response.form_ref_id, granularity, bucket, dimension, getattr(response, column) or "")] += 1
+    if not counts:
+        return
+
+    columns = list(zip(*((*key, total) for key, total in counts.items())))
+    db = using_db or connections.get("default")
+    await db.execute_query(UPSERT_SQL, [list(column) for column in columns])
+
+
+async def rebuild_rollups(form_ids: Optional[Sequence[str]] = None) -> None:
+    """
+    Recomputes the rollups of the given forms, or of every form, from ``FormResponse``.
+    """
+    async with in_transaction() as conn:
+        if form_ids:
+            ids = [list(form_ids)]
+            await conn.execute_query('DELETE FROM "response_rollups" WHERE "form_ref_id" = ANY($1::uuid[])', ids)
+            await conn.execute_query(REBUILD_SQL.format(where='WHERE r."form_ref_id" = ANY($1::uuid[])'), ids)
+        else:
+            await conn.execute_query('DELETE FROM "response_rollups"')
+            await conn.execute_query(REBUILD_SQL.format(where=""))
+
+
+async def main(form_ids: Sequence[str]) -> None:
+    from config import db_config
+
+    await Tortoise.init(config=db_config)
+    try:
+        await rebuild_rollups(form_ids)
+        print(f"Rebuilt response rollups for {len(form_ids) or 'all'} form(s)")
+    finally:
+        await connections.close_all()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:]))
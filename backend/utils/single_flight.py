@@ -0,0 +1,41 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into one execution.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it runs await the same task instead of repeating it. The task is
+    shielded, so a caller that disconnects does not cancel the work for the
+    others. Nothing is remembered once the task finishes; caching the result
+    is left to the caller.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, "asyncio.Task[Any]"] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._done(key, done))
+        return await asyncio.shield(task)
+
+    def forget(self, key: Hashable) -> None:
+        """Lets the next call for ``key`` start fresh work, e.g. after the data changed."""
+        self._calls.pop(key, None)
+
+    def _done(self, key: Hashable, task: "asyncio.Task[Any]") -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every caller went away
+            task.exception()
@@ -0,0 +1,127 @@
+"""
+In-memory catalog of the public template gallery.
+
+The gallery used to format every template on every request (owner lookup and
+field counts per template). The catalog instead keeps a snapshot of the
+gallery rows with ``total_fields`` and the owner display name already
+computed, built by a single aggregate query. Saving or deleting a template
+marks the snapshot stale and the next request rebuilds it; a TTL bounds how
+long changes made outside the ORM (e.g. an owner renaming their company) can
+take to show up.
+"""
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+from tortoise import connections
+from tortoise.signals import post_delete, post_save
+from models import Forms
+from .format_forms import FormTemplateResponse
+from .pagination import DEFAULT_PAGE_SIZE, Page, paginate_sorted
+from .single_flight import SingleFlight
+
+TEMPLATE_CATALOG_TTL = float(os.getenv("TEMPLATE_CATALOG_TTL", 300))
+
+TEMPLATE_CATALOG_SQL = """
+SELECT
+    f."id", f."title", f."detail", f."cover_image", f."created_at",
+    COALESCE(NULLIF(u."company", ''), concat_ws(' ', u."first_name", u."last_name")) AS "owner",
+    (SELECT COUNT(*) FROM "Form Fields" ff WHERE ff."form_ref_id" = f."id") AS "total_fields"
+FROM "forms" f
+JOIN "user" u ON u."id" = f."owner_id"
+WHERE f."as_template" AND NOT f."draft"
+ORDER BY f."created_at", f."id"
+"""
+
+
+class TemplateCatalog:
+    """Snapshot of the template gallery, rebuilt lazily after changes."""
+
+    def __init__(self, ttl: float = TEMPLATE_CATALOG_TTL):
+        self.ttl = ttl
+        self._keys: List[Tuple[datetime, UUID]] = []
+        self._rows: List[Dict[str, Any]] = []
+        self._ids: Set[UUID] = set()
+        self._built_at: Optional[float] = None
+        # Bumped by every invalidation; the snapshot is current when it was
+        # built from the latest generation.
+        self._generation = 0
+        self._built_generation = -1
+        self._rebuilds = SingleFlight()
+
+    def __contains__(self, form_id: UUID) -> bool:
+        return form_id in self._ids
+
+    @property
+    def stale(self) -> bool:
+        return (
+            self._built_generation != self._generation
+            or self._built_at is None
+            or time.monotonic() - self._built_at > self.ttl
+        )
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._rebuilds.forget("catalog")
+
+    async def _rebuild(self) -> None:
+        generation = self._generation
+        rows = await connections.get("default").execute_query_dict(TEMPLATE_CATALOG_SQL)
+        self._keys = [(row["created_at"], row["id"]) for row in rows]
+        self._ids = {row["id"] for row in rows}
+        self._rows = [
+            FormTemplateResponse(
+                id=str(row["id"]),
+                title=row["title"],
+                detail=row["detail"] or "",
+                total_fields=row["total_fields"],
+                cover_image=row["cover_image"] or None,
+                owner=row["owner"],
+            ).model_dump()
+            for row in rows
+        ]
+        self._built_at = time.monotonic()
+        self._built_generation = generation
+
+    async def _ensure_fresh(self) -> None:
+        if self.stale:
+            await self._rebuilds.do("catalog", self._rebuild)
+
+    async def page(self, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        """
+        Returns one page of the gallery, newest template first.
+
+        Raises:
+            InvalidCursor: If ``cursor`` is not a pagination cursor.
+        """
+        await self._ensure_fresh()
+        return paginate_sorted(self._keys, self._rows, cursor, limit)
+
+    async def all(self) -> List[Dict[str, Any]]:
+        """Returns the whole gallery, newest template first."""
+        await self._ensure_fresh()
+        return self._rows[::-1]
+
+    async def total(self) -> int:
+        await self._ensure_fresh()
+        return len(self._rows)
+
+
+template_catalog = TemplateCatalog()
+
+
+def template_changed(form: Forms) -> None:
+    """Marks the catalog stale if ``form`` is, or was, part of the gallery."""
+    if form.as_template or form.id in template_catalog:
+        template_catalog.invalidate()
+
+
+@post_save(Forms)
+async def _form_saved(sender, instance: Forms, created, using_db, update_fields) -> None:
+    template_changed(instance)
+
+
+@post_delete(Forms)
+async def _form_deleted(sender, instance: Forms, using_db) -> None:
+    template_changed(instance)
@@ -1,4 +1,54 @@
+import os
+from tortoise.signals import post_delete, post_save
 from models.users import User
+from .cache import LRUCache
+
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", 10000))
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", 30))
+# Remember unknown ids (e.g. tokens of deleted accounts) for this many
+# seconds; 0 disables the negative cache.
+USER_NEGATIVE_CACHE_TTL = float(os.getenv("USER_NEGATIVE_CACHE_TTL", 0))
+
+# user id -> User, or None for an unknown id. The TTL bounds how long another
+# worker process can keep serving a user changed elsewhere; in this process
+# every save or delete of a user evicts it right away.
+user_cache = LRUCache("users", max_entries=USER_CACHE_SIZE, ttl=USER_CACHE_TTL)
+
+_NOT_CACHED = object()
+
 
 async def get_user_by_id(**kwargs) -> User | None:
-    return await User.filter(id=kwargs.get("user_id")).first()
\ No newline at end of file
+    """
+    Loads the user of an authenticated request, through ``user_cache``.
+
+    Called by the JWT backend with the token payload as keyword arguments.
+    """
+    if not kwargs.get("user_id"):
+        return None
+    user_id = str(kwargs["user_id"])
+    user = user_cache.get(user_id, _NOT_CACHED)
+    if user is not _NOT_CACHED:
+        return user
+
+    user = await User.filter(id=user_id).first()
+    if user is not None:
+        user_cache.set(user_id, user)
+    elif USER_NEGATIVE_CACHE_TTL > 0:
+        user_cache.set(user_id, None, ttl=USER_NEGATIVE_CACHE_TTL)
+    return user
+
+
+def invalidate_user(user_id) -> None:
+    user_cache.pop(str(user_id))
+
+
+@post_save(User)
+async def _user_saved(sender, instance: User, created, using_db, update_fields) -> None:
+    # Covers account updates, confirmation and password resets; a new
+    # account also clears a negative entry for its id.
+    invalidate_user(instance.id)
+
+
+@post_delete(User)
+async def _user_deleted(sender, instance: User, using_db) -> None:
+    invalidate_user(instance.id)
@@ -0,0 +1,56 @@
+import json
+import os
+from typing import Any, Dict, Optional
+from pydantic import BaseModel
+from models import Forms
+from .cache import LRUCache
+from .format_forms import format_form
+from .pydantic_conv import create_model_from_form
+from .single_flight import SingleFlight
+
+VALIDATOR_CACHE_SIZE = int(os.getenv("VALIDATOR_CACHE_SIZE", 512))
+VALIDATOR_CACHE_MAX_BYTES = int(os.getenv("VALIDATOR_CACHE_MAX_BYTES", 16 * 1024 * 1024))
+
+# form id -> (updated_at, compiled model). Weight is the size of the serialized
+# form definition, a rough proxy for the size of the model built from it.
+validator_cache = LRUCache(
+    "submission_validators",
+    max_entries=VALIDATOR_CACHE_SIZE,
+    max_weight=VALIDATOR_CACHE_MAX_BYTES,
+)
+_builds = SingleFlight()
+
+
+async def get_submission_validator(form: Forms, form_data: Optional[Dict[str, Any]] = None) -> type[BaseModel]:
+    """
+    Returns the compiled pydantic model used to validate submissions to a form.
+
+    Models are cached per form and reused until the form's ``updated_at``
+    changes, so hot forms validate without rebuilding the model or loading
+    the form tree. Concurrent misses for the same form version share one build.
+
+    Args:
+        form (Forms): The form being submitted to.
+        form_data (dict, optional): ``format_form(form)``, when the caller already has it.
+
+    Returns:
+        type[BaseModel]: The submission model for the current form version.
+    """
+    version = form.updated_at
+    cached = validator_cache.get(form.id, is_stale=lambda entry: entry[0] != version)
+    if cached is not None:
+        return cached[1]
+
+    return await _builds.do((form.id, version), lambda: _build_validator(form, form_data))
+
+
+async def _build_validator(form: Forms, form_data: Optional[Dict[str, Any]]) -> type[BaseModel]:
+    if form_data is None:
+        form_data = await format_form(form)
+    model = create_model_from_form(form_data)
+    validator_cache.set(
+        form.id,
+        (form.updated_at, model),
+        weight=len(json.dumps(form_data, default=str)),
+    )
+    return model